@@ -3,12 +3,19 @@ Web-based Chatbot UI using FastAPI and WebSockets
 Real-time chat interface for RagaAI Medical Scheduling Agent
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, WebSocket
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.websockets import WebSocketState
 import json
 import asyncio
-from typing import Dict, List
+import re
+import dataclasses
+import time
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Set, Tuple
 # Try to import Ollama agent first, then OpenAI, then fallback to rule-based
 try:
     from src.ollama_agent import OllamaMedicalSchedulingAgent
@@ -39,961 +46,506 @@ except Exception as e:
         LLM_AVAILABLE = False
         LLM_TYPE = "Rule-based"
 
-from src.agent import ConversationState
+from src.agent import ConversationState, AgentReplyError
+from config import Config
+from server_config import MAX_MESSAGE_SIZE, SERVER_OPTIONS
 import uvicorn
 import os
+from importlib.util import find_spec
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Use orjson for WebSocket payloads when it is installed, stdlib json otherwise.
+# Outbound payloads are UTF-8 bytes sent as binary frames. Values read from the
+# pandas tables (numpy scalars, Timestamps) are serialized rather than rejected,
+# and dataclasses serialize as objects.
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    json_loads = orjson.loads
+except ImportError:
+    def _json_default(obj):
+        if dataclasses.is_dataclass(obj):
+            return dataclasses.asdict(obj)
+        return str(obj)
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+    json_loads = json.loads
+
+# Connection events are logged through a queue so the console write happens on the
+# listener's thread instead of the event loop
+logger = logging.getLogger("chatbot_ui")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+log_listener = QueueListener(_log_queue, logging.StreamHandler())
 
 app = FastAPI(title="RagaAI Medical Scheduling Agent")
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# The chat page, stylesheet and client script are static files (see the mount at the
+# bottom of this module), so browsers can cache them and revalidate with ETags
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+# Number of sockets written concurrently per broadcast batch
+BROADCAST_BATCH_SIZE = 50
+
+# Idle agents kept ready for new connections, and how many to build at startup
+AGENT_POOL_SIZE = 64
+AGENT_POOL_WARM = 2
+# Most user turns a connection may have in flight before the server stops reading
+TURN_WINDOW = 4
+# Files an agent snapshots when it loads its data; a pooled agent loaded before
+# their latest change is stale and is discarded
+AGENT_DATA_FILES = ("data/patients.csv", "data/schedules.xlsx", "data/schedules_new.xlsx")
+
+def create_agent():
+    """Create an agent for one conversation, falling back to the rule-based agent.
+
+    Agents load the patient and schedule files when constructed, so callers on the
+    event loop should run this in a worker thread.
+    """
+    try:
+        return LLMMedicalSchedulingAgent()
+    except Exception as e:
+        logger.error(f"❌ Error creating agent: {e}")
+        # Fallback to rule-based agent
+        from src.agent import MedicalSchedulingAgent
+        return MedicalSchedulingAgent()
+
+def is_reusable(agent) -> bool:
+    """Agents that can reset their conversation and reload their data can be pooled.
+
+    Also accepts an agent class, to check before paying for a construction.
+    """
+    return hasattr(agent, "reset_conversation") and hasattr(agent, "reload_data")
+
+def recycle_agent(agent):
+    """Reset a used agent for a new conversation (blocking: reloads the data files)"""
+    agent.reset_conversation()
+    agent.reload_data()
+
+def data_files_mtime() -> float:
+    """Latest modification time of the files agents load at construction"""
+    return max((os.path.getmtime(path) for path in AGENT_DATA_FILES if os.path.exists(path)), default=0.0)
 
 # Store active connections
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.agent_instances: Dict[WebSocket, LLMMedicalSchedulingAgent] = {}
+        self.outbound_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writer_tasks: Dict[WebSocket, asyncio.Task] = {}
+        # Turns are pipelined per connection, but one agent runs one turn at a time
+        self.agent_locks: Dict[WebSocket, asyncio.Lock] = {}
+        self.turn_slots: Dict[WebSocket, asyncio.Semaphore] = {}
+        self.broadcast_queue: Optional[asyncio.Queue] = None
+        self.broadcast_task: Optional[asyncio.Task] = None
+        # Idle agents as (time their data was loaded, agent), newest last
+        self.agent_pool: List[Tuple[float, LLMMedicalSchedulingAgent]] = []
+        self.pool_tasks: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        # Create a new agent instance for this connection
+        self.active_connections.add(websocket)
+        # Outbound messages go through a per-connection queue drained by a writer task
+        self.outbound_queues[websocket] = asyncio.Queue()
+        self.writer_tasks[websocket] = asyncio.create_task(self._writer(websocket))
+        self.agent_locks[websocket] = asyncio.Lock()
+        self.turn_slots[websocket] = asyncio.Semaphore(TURN_WINDOW)
+        self.agent_instances[websocket] = await self.acquire_agent()
+        logger.info(f"New connection established. Total connections: {len(self.active_connections)}")
+
+    def disconnect(self, websocket: WebSocket):
+        # Both the endpoint and a failed broadcast may disconnect the same socket
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.discard(websocket)
+        agent = self.agent_instances.pop(websocket, None)
+        lock = self.agent_locks.pop(websocket, None)
+        self.turn_slots.pop(websocket, None)
+        if agent is not None:
+            self.run_in_background(self.release_when_idle(agent, lock))
+        self.outbound_queues.pop(websocket, None)
+        writer_task = self.writer_tasks.pop(websocket, None)
+        # A failed writer disconnects its own socket; it is already on its way out
+        if writer_task and writer_task is not asyncio.current_task():
+            writer_task.cancel()
+        logger.info(f"Connection closed. Total connections: {len(self.active_connections)}")
+
+    async def acquire_agent(self):
+        """Take a pooled agent whose data is still current, or build one off the event loop"""
+        latest_change = data_files_mtime()
+        while self.agent_pool:
+            loaded_at, agent = self.agent_pool.pop()
+            if loaded_at >= latest_change:
+                return agent
+        return await asyncio.to_thread(create_agent)
+
+    async def release_agent(self, agent):
+        """Reset a finished conversation's agent and return it to the pool"""
+        if not is_reusable(agent) or len(self.agent_pool) >= AGENT_POOL_SIZE:
+            return
+        loaded_at = time.time()
+        await asyncio.to_thread(recycle_agent, agent)
+        self.agent_pool.append((loaded_at, agent))
+
+    async def release_when_idle(self, agent, lock: Optional[asyncio.Lock]):
+        """Let turns still running on the agent finish before it is recycled"""
+        if lock is None:
+            await self.release_agent(agent)
+            return
+        async with lock:
+            await self.release_agent(agent)
+
+    async def warm_pool(self, count: int):
+        # Only pooled agents are worth building ahead; others would be thrown away
+        if not is_reusable(LLMMedicalSchedulingAgent):
+            return
+        for _ in range(count):
+            loaded_at = time.time()
+            agent = await asyncio.to_thread(create_agent)
+            if not is_reusable(agent):
+                return
+            self.agent_pool.append((loaded_at, agent))
+
+    def run_in_background(self, coro):
+        # Keep a reference so the task is not garbage collected before it finishes
+        task = asyncio.create_task(coro)
+        self.pool_tasks.add(task)
+        task.add_done_callback(self.pool_tasks.discard)
+
+    async def send_personal_message(self, message: bytes, websocket: WebSocket):
+        queue = self.outbound_queues.get(websocket)
+        # Pipelined turns may finish after the client has gone; drop their replies
+        if queue is not None:
+            queue.put_nowait(message)
+
+    async def _writer(self, websocket: WebSocket):
+        """Send queued messages, coalescing everything queued meanwhile into one frame
+
+        Nagle is already off: asyncio and uvloop set TCP_NODELAY on every TCP transport
+        they create, so coalescing is done here rather than by the kernel.
+        """
+        queue = self.outbound_queues[websocket]
         try:
-            if LLM_AVAILABLE:
-                self.agent_instances[websocket] = LLMMedicalSchedulingAgent()
-            else:
-                self.agent_instances[websocket] = LLMMedicalSchedulingAgent()
+            while True:
+                messages = [await queue.get()]
+                while not queue.empty():
+                    messages.append(queue.get_nowait())
+                if len(messages) == 1:
+                    await websocket.send_bytes(messages[0])
+                else:
+                    # Messages are already serialized JSON, so splice them into the array
+                    await websocket.send_bytes(
+                        b'{"type":"batch","messages":[' + b",".join(messages) + b"]}"
+                    )
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            print(f"❌ Error creating agent: {e}")
-            # Fallback to rule-based agent
-            from src.agent import MedicalSchedulingAgent
-            self.agent_instances[websocket] = MedicalSchedulingAgent()
-        print(f"New connection established. Total connections: {len(self.active_connections)}")
+            logger.error(f"❌ Error sending message: {e}")
+            # Nothing drains the queue any more: unregister the socket so sends and
+            # broadcasts stop queueing for it, and close it so the endpoint loop ends
+            self.disconnect(websocket)
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if websocket in self.agent_instances:
-            del self.agent_instances[websocket]
-        print(f"Connection closed. Total connections: {len(self.active_connections)}")
+    def start_broadcaster(self):
+        """Start the background task that delivers broadcasts"""
+        self.broadcast_queue = asyncio.Queue()
+        self.broadcast_task = asyncio.create_task(self._broadcaster())
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+    def stop_broadcaster(self):
+        if self.broadcast_task:
+            self.broadcast_task.cancel()
+            self.broadcast_task = None
 
-    async def broadcast(self, message: str):
+    def broadcast(self, message: bytes):
+        """Queue a serialized frame for every connection; never blocks the caller on sends"""
+        if self.broadcast_queue is None:
+            logger.warning("⚠️  Broadcaster not started; dropping broadcast")
+            return
+        self.broadcast_queue.put_nowait(message)
+
+    async def _broadcaster(self):
+        while True:
+            message = await self.broadcast_queue.get()
+            try:
+                await self._send_to_all(message)
+            except Exception as e:
+                logger.error(f"❌ Error broadcasting message: {e}")
+
+    async def _send_to_all(self, message: bytes):
+        # Skip sockets that are already closed instead of letting their sends fail
+        connections = []
+        dead_connections = []
         for connection in self.active_connections:
-            await connection.send_text(message)
+            if (connection.client_state == WebSocketState.CONNECTED
+                    and connection.application_state == WebSocketState.CONNECTED):
+                connections.append(connection)
+            else:
+                dead_connections.append(connection)
+        # Send concurrently in batches, yielding to the event loop between batches
+        for i in range(0, len(connections), BROADCAST_BATCH_SIZE):
+            batch = connections[i:i + BROADCAST_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(connection.send_bytes(message) for connection in batch),
+                return_exceptions=True
+            )
+            dead_connections.extend(
+                connection for connection, result in zip(batch, results)
+                if isinstance(result, Exception)
+            )
+            await asyncio.sleep(0)
+        # One dead socket must not abort the broadcast; drop it afterwards
+        for connection in dead_connections:
+            self.disconnect(connection)
 
 manager = ConnectionManager()
 
-# HTML template for the chat interface
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RagaAI Medical Scheduling Agent</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 50%, #f0fdf4 100%);
-            height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            margin: 0;
-            padding: 20px;
-        }
-        
-        .chat-container {
-            width: 90%;
-            max-width: 900px;
-            height: 85vh;
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(20px);
-            border-radius: 24px;
-            box-shadow: 0 25px 50px rgba(0, 0, 0, 0.08), 0 0 0 1px rgba(255, 255, 255, 0.2);
-            display: flex;
-            flex-direction: column;
-            overflow: hidden;
-            border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        
-        .chat-header {
-            background: linear-gradient(135deg, #059669 0%, #047857 50%, #065f46 100%);
-            color: white;
-            padding: 24px;
-            text-align: center;
-            position: relative;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        }
-        
-        .chat-header h1 {
-            font-size: 28px;
-            margin-bottom: 8px;
-            font-weight: 700;
-            letter-spacing: -0.5px;
-        }
-        
-        .chat-header p {
-            opacity: 0.9;
-            font-size: 15px;
-            font-weight: 400;
-        }
-        
-        .status-indicator {
-            position: absolute;
-            top: 24px;
-            right: 24px;
-            width: 14px;
-            height: 14px;
-            border-radius: 50%;
-            background: #10b981;
-            animation: pulse 2s infinite;
-            box-shadow: 0 0 0 4px rgba(16, 185, 129, 0.2);
-        }
-        
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-        
-        .chat-messages {
-            flex: 1;
-            padding: 24px;
-            overflow-y: auto;
-            background: linear-gradient(180deg, #fafafa 0%, #f5f5f5 100%);
-            scroll-behavior: smooth;
-        }
-        
-        .chat-messages::-webkit-scrollbar {
-            width: 6px;
-        }
-        
-        .chat-messages::-webkit-scrollbar-track {
-            background: transparent;
-        }
-        
-        .chat-messages::-webkit-scrollbar-thumb {
-            background: rgba(0, 0, 0, 0.1);
-            border-radius: 3px;
-        }
-        
-        .chat-messages::-webkit-scrollbar-thumb:hover {
-            background: rgba(0, 0, 0, 0.2);
-        }
-        
-        .message {
-            margin-bottom: 20px;
-            display: flex;
-            align-items: flex-start;
-            animation: fadeInUp 0.3s ease-out;
-        }
-        
-        @keyframes fadeInUp {
-            from {
-                opacity: 0;
-                transform: translateY(10px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        .message.user {
-            justify-content: flex-end;
-        }
-        
-        .message.assistant {
-            justify-content: flex-start;
-        }
-        
-        .message-content {
-            max-width: 75%;
-            padding: 16px 20px;
-            border-radius: 20px;
-            word-wrap: break-word;
-            position: relative;
-            line-height: 1.5;
-            font-size: 15px;
-        }
-        
-        .message.user .message-content {
-            background: linear-gradient(135deg, #059669 0%, #047857 100%);
-            color: white;
-            border-bottom-right-radius: 6px;
-            box-shadow: 0 4px 12px rgba(5, 150, 105, 0.3);
-        }
-        
-        .message.assistant .message-content {
-            background: white;
-            color: #374151;
-            border: 1px solid #e5e7eb;
-            border-bottom-left-radius: 6px;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05), 0 1px 3px rgba(0, 0, 0, 0.1);
-        }
-        
-        .message.assistant.success .message-content {
-            background: linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%);
-            border-color: #10b981;
-            color: #065f46;
-            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.15);
-        }
-        
-        .message.assistant.error .message-content {
-            background: linear-gradient(135deg, #fef2f2 0%, #fee2e2 100%);
-            border-color: #ef4444;
-            color: #991b1b;
-            box-shadow: 0 4px 12px rgba(239, 68, 68, 0.15);
-        }
-        
-        .message-time {
-            font-size: 12px;
-            opacity: 0.6;
-            margin-top: 6px;
-            font-weight: 400;
-        }
-        
-        .chat-input-container {
-            padding: 24px;
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-top: 1px solid rgba(229, 231, 235, 0.5);
-        }
-        
-        .chat-input-wrapper {
-            display: flex;
-            gap: 12px;
-            align-items: center;
-        }
-        
-        .chat-input {
-            flex: 1;
-            padding: 16px 20px;
-            border: 2px solid #e5e7eb;
-            border-radius: 28px;
-            font-size: 15px;
-            outline: none;
-            transition: all 0.3s ease;
-            background: rgba(255, 255, 255, 0.8);
-            backdrop-filter: blur(10px);
-        }
-        
-        .chat-input:focus {
-            border-color: #059669;
-            box-shadow: 0 0 0 3px rgba(5, 150, 105, 0.1);
-            background: white;
-        }
-        
-        .send-button {
-            padding: 16px 24px;
-            background: linear-gradient(135deg, #059669 0%, #047857 100%);
-            color: white;
-            border: none;
-            border-radius: 28px;
-            cursor: pointer;
-            font-size: 15px;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 12px rgba(5, 150, 105, 0.3);
-        }
-        
-        .send-button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(5, 150, 105, 0.4);
-        }
-        
-        .send-button:active {
-            transform: translateY(0);
-        }
-        
-        .send-button:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-            box-shadow: 0 2px 6px rgba(5, 150, 105, 0.2);
-        }
-        
-        .quick-actions {
-            display: flex;
-            gap: 12px;
-            margin-bottom: 20px;
-            flex-wrap: wrap;
-        }
-        
-        .quick-action {
-            padding: 10px 16px;
-            background: rgba(255, 255, 255, 0.8);
-            border: 1px solid #e5e7eb;
-            border-radius: 20px;
-            cursor: pointer;
-            font-size: 13px;
-            font-weight: 500;
-            transition: all 0.3s ease;
-            backdrop-filter: blur(10px);
-        }
-        
-        .quick-action:hover {
-            background: rgba(5, 150, 105, 0.1);
-            border-color: #059669;
-            transform: translateY(-1px);
-        }
-        
-        .typing-indicator {
-            display: none;
-            padding: 16px 20px;
-            background: white;
-            border-radius: 20px;
-            border-bottom-left-radius: 6px;
-            margin-bottom: 20px;
-            max-width: 75%;
-            border: 1px solid #e5e7eb;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05);
-        }
-        
-        .typing-dots {
-            display: flex;
-            gap: 4px;
-        }
-        
-        .typing-dot {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            background: #059669;
-            animation: typing 1.4s infinite;
-        }
-        
-        .typing-dot:nth-child(2) {
-            animation-delay: 0.2s;
-        }
-        
-        .typing-dot:nth-child(3) {
-            animation-delay: 0.4s;
-        }
-        
-        @keyframes typing {
-            0%, 60%, 100% {
-                transform: translateY(0);
-            }
-            30% {
-                transform: translateY(-10px);
-            }
-        }
-        
-        .connection-status {
-            position: fixed;
-            top: 20px;
-            left: 20px;
-            padding: 12px 18px;
-            border-radius: 24px;
-            color: white;
-            font-size: 13px;
-            font-weight: 600;
-            z-index: 1000;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-        }
-        
-        .connection-status.connected {
-            background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        }
-        
-        .connection-status.disconnected {
-            background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        }
-        
-        .appointment-summary {
-            background: linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%);
-            border: 1px solid #10b981;
-            border-radius: 16px;
-            padding: 20px;
-            margin: 15px 0;
-            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.15);
-        }
-        
-        .appointment-summary h4 {
-            color: #065f46;
-            margin-bottom: 12px;
-            font-size: 18px;
-            font-weight: 700;
-        }
-        
-                 .appointment-summary p {
-             margin: 6px 0;
-             font-size: 15px;
-             color: #047857;
-         }
-         
-         .doctor-selection {
-             background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
-             border: 1px solid #0ea5e9;
-             border-radius: 16px;
-             padding: 20px;
-             margin: 15px 0;
-             box-shadow: 0 4px 12px rgba(14, 165, 233, 0.15);
-         }
-         
-         .doctor-selection h4 {
-             color: #0c4a6e;
-             margin-bottom: 15px;
-             font-size: 18px;
-             font-weight: 700;
-         }
-         
-         .doctor-search {
-             margin-bottom: 15px;
-         }
-         
-         .doctor-search input {
-             width: 100%;
-             padding: 12px 16px;
-             border: 2px solid #e5e7eb;
-             border-radius: 12px;
-             font-size: 14px;
-             outline: none;
-             transition: all 0.3s ease;
-             background: white;
-         }
-         
-         .doctor-search input:focus {
-             border-color: #0ea5e9;
-             box-shadow: 0 0 0 3px rgba(14, 165, 233, 0.1);
-         }
-         
-         .doctor-grid {
-             display: grid;
-             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-             gap: 10px;
-             max-height: 200px;
-             overflow-y: auto;
-         }
-         
-         .doctor-option {
-             padding: 12px 16px;
-             background: white;
-             border: 2px solid #e5e7eb;
-             border-radius: 12px;
-             cursor: pointer;
-             font-size: 14px;
-             font-weight: 500;
-             transition: all 0.3s ease;
-             text-align: center;
-         }
-         
-         .doctor-option:hover {
-             border-color: #0ea5e9;
-             background: #f0f9ff;
-             transform: translateY(-1px);
-         }
-         
-         .doctor-option.selected {
-             border-color: #059669;
-             background: #ecfdf5;
-             color: #065f46;
-         }
-         
-         .doctor-grid::-webkit-scrollbar {
-             width: 6px;
-         }
-         
-         .doctor-grid::-webkit-scrollbar-track {
-             background: transparent;
-         }
-         
-         .doctor-grid::-webkit-scrollbar-thumb {
-             background: rgba(0, 0, 0, 0.1);
-             border-radius: 3px;
-         }
-         
-         .change-selection-btn {
-             padding: 8px 16px;
-             background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-             color: white;
-             border: none;
-             border-radius: 12px;
-             cursor: pointer;
-             font-size: 13px;
-             font-weight: 600;
-             transition: all 0.3s ease;
-             box-shadow: 0 2px 8px rgba(245, 158, 11, 0.3);
-         }
-         
-         .change-selection-btn:hover {
-             transform: translateY(-1px);
-             box-shadow: 0 4px 12px rgba(245, 158, 11, 0.4);
-         }
-     </style>
-</head>
-<body>
-    <div class="connection-status" id="connectionStatus">Connecting...</div>
+@app.on_event("startup")
+async def start_background_tasks():
+    log_listener.start()
+    # Create the data/export directories once per process rather than on demand
+    Config.ensure_directories()
+    # Agent calls run in the default executor; size it for blocking I/O
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+    )
+    manager.start_broadcaster()
+    manager.run_in_background(manager.warm_pool(AGENT_POOL_WARM))
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    manager.stop_broadcaster()
+    log_listener.stop()
+
+# Replies mentioning these words are shown as errors; one case-insensitive scan
+# instead of lowercasing the whole reply twice
+ERROR_WORDS_RE = re.compile(r"error|sorry", re.IGNORECASE)
+
+def now_ms() -> int:
+    """Server time in epoch milliseconds, as stamped on outbound frames"""
+    return time.time_ns() // 1_000_000
+
+def appointment_summary(appointment) -> dict:
+    """The fields the summary card shows; contact and insurance details stay on the server"""
+    patient = appointment.patient
+    return {
+        "patient": f"{patient.first_name} {patient.last_name}".strip(),
+        "patient_type": patient.patient_type,
+        "doctor": appointment.doctor,
+        "date": appointment.date,
+        "time": appointment.time,
+        "duration": appointment.duration,
+    }
+
+def message_payload(message: str, message_type: str = "normal", client_id=None) -> bytes:
+    """Serialize a chat message frame; "normal" is the client's default message_type, so it is omitted
+
+    client_id echoes the clientId of the user message being answered, which acks it.
+    "ts" is the server time in epoch milliseconds; the client formats it for display.
+    """
+    payload = {"type": "message", "message": message, "ts": now_ms()}
+    if message_type != "normal":
+        payload["message_type"] = message_type
+    if client_id is not None:
+        payload["clientId"] = client_id
+    return json_dumps(payload)
+
+RESET_MESSAGE = "🔄 Conversation reset! Hello! I'm your AI medical scheduling assistant. How can I help you today?"
+AGENT_NOT_FOUND_MESSAGE = "❌ Agent not found. Please refresh the page."
+EMPTY_REPLY_MESSAGE = "❌ I didn't get a reply for that. Please try again."
+
+@lru_cache(maxsize=32)
+def doctor_selection_payload(doctors: tuple) -> bytes:
+    """Serialized doctor picker frame; the roster rarely changes, so cache it per roster"""
+    return json_dumps({"type": "doctor_selection", "doctors": list(doctors)})
+
+async def iter_frames(websocket: WebSocket):
+    """Yield raw frame payloads (text or bytes) until the client disconnects
+
+    Binary frames go straight to json_loads without a UTF-8 decode.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        data = message.get("bytes")
+        yield data if data is not None else message["text"]
+
+async def iter_in_thread(generator_function, *args):
+    """Run a blocking generator in a worker thread, yielding its items on the event loop"""
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue()
+    finished = object()
     
-    <div class="chat-container">
-        <div class="chat-header">
-            <div class="status-indicator"></div>
-            <h1>🏥 RagaAI Medical Scheduling Agent</h1>
-            <p>Your AI assistant for medical appointment booking</p>
-        </div>
-        
-        <div class="chat-messages" id="chatMessages">
-            <div class="message assistant">
-                <div class="message-content">
-                    <div>Hello! I'm your AI medical scheduling assistant. I can help you book appointments, check availability, and manage your medical visits. How can I assist you today?</div>
-                    <div class="message-time" id="welcomeTime"></div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="typing-indicator" id="typingIndicator">
-            <div class="typing-dots">
-                <div class="typing-dot"></div>
-                <div class="typing-dot"></div>
-                <div class="typing-dot"></div>
-            </div>
-        </div>
-        
-        <div class="chat-input-container">
-            <div class="quick-actions">
-                <button class="quick-action" onclick="sendQuickMessage('Hi, I\\'d like to book an appointment')">Book Appointment</button>
-                <button class="quick-action" onclick="sendQuickMessage('What doctors are available?')">Available Doctors</button>
-                <button class="quick-action" onclick="sendQuickMessage('Help')">Help</button>
-                <button class="quick-action" onclick="resetConversation()">Reset</button>
-            </div>
-            
-            <div class="chat-input-wrapper">
-                <input type="text" class="chat-input" id="messageInput" placeholder="Type your message here..." autocomplete="off">
-                <button class="send-button" id="sendButton" onclick="sendMessage()">Send</button>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let ws;
-        let isConnected = false;
+    def produce():
+        try:
+            for item in generator_function(*args):
+                loop.call_soon_threadsafe(items.put_nowait, item)
+        finally:
+            loop.call_soon_threadsafe(items.put_nowait, finished)
+    
+    producer = loop.run_in_executor(None, produce)
+    while (item := await items.get()) is not finished:
+        yield item
+    # Re-raise anything the generator raised
+    await producer
+
+async def stream_response(websocket: WebSocket, agent, user_message: str, client_id) -> str:
+    """Forward the agent's reply as chunk frames while it is generated; returns the full reply"""
+    parts = []
+    async for delta in iter_in_thread(agent.process_message_stream, user_message):
+        parts.append(delta)
+        await manager.send_personal_message(
+            json_dumps({"type": "chunk", "delta": delta, "clientId": client_id, "ts": now_ms()}),
+            websocket
+        )
+    return "".join(parts)
+
+async def handle_turn(websocket: WebSocket, lock: asyncio.Lock, user_message: str, client_id):
+    """Run one user turn and send its frames; replies carry the turn's clientId"""
+    async with lock:
+        # Look the agent up under the lock: a reset queued before this turn may replace it
+        agent = manager.agent_instances.get(websocket)
+        if not agent:
+            await manager.send_personal_message(message_payload(AGENT_NOT_FOUND_MESSAGE, "error", client_id), websocket)
+            return
         
-        function connect() {
-            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            const wsUrl = `${protocol}//${window.location.host}/ws`;
-            
-            ws = new WebSocket(wsUrl);
-            
-            ws.onopen = function(event) {
-                isConnected = true;
-                updateConnectionStatus('connected', 'Connected');
-                console.log('Connected to WebSocket');
-            };
+        try:
+            # Process through AI agent; it may block on LLM calls or file I/O
+            previous_state = agent.conversation_state
+            streaming = hasattr(agent, "process_message_stream")
+            if streaming:
+                response = await stream_response(websocket, agent, user_message, client_id)
+            else:
+                response = await asyncio.to_thread(agent.process_message, user_message)
             
-                         ws.onmessage = function(event) {
-                 const data = JSON.parse(event.data);
-                 hideTypingIndicator();
-                 
-                 if (data.type === 'message') {
-                     addMessage(data.message, 'assistant', data.message_type || 'normal');
-                     
-                     // Check if this is a doctor selection message
-                     if (data.message.includes('Which doctor would you like to see?') && data.message.includes('Available doctors:')) {
-                         const doctorList = data.message.split('Available doctors: ')[1];
-                         showDoctorSelection(doctorList);
-                     }
-                 } else if (data.type === 'appointment_summary') {
-                     showAppointmentSummary(data.appointment);
-                 } else if (data.type === 'status') {
-                     updateConnectionStatus('connected', data.message);
-                 }
-             };
+            # Determine message type
+            message_type = "normal"
+            if agent.conversation_state == ConversationState.COMPLETED:
+                message_type = "success"
+            elif ERROR_WORDS_RE.search(response):
+                message_type = "error"
             
-            ws.onclose = function(event) {
-                isConnected = false;
-                updateConnectionStatus('disconnected', 'Disconnected');
-                console.log('WebSocket connection closed');
-                
-                // Try to reconnect after 3 seconds
-                setTimeout(connect, 3000);
-            };
+            # Send response; a streamed one only needs closing off, unless nothing was
+            # streamed and the client has no bubble to close
+            if streaming and not response:
+                await manager.send_personal_message(message_payload(EMPTY_REPLY_MESSAGE, "error", client_id), websocket)
+            elif streaming:
+                await manager.send_personal_message(
+                    json_dumps({"type": "message_end", "clientId": client_id, "message_type": message_type}),
+                    websocket
+                )
+            else:
+                await manager.send_personal_message(message_payload(response, message_type, client_id), websocket)
             
-            ws.onerror = function(error) {
-                console.error('WebSocket error:', error);
-                updateConnectionStatus('disconnected', 'Connection Error');
-            };
-        }
-        
-        function sendMessage() {
-            const input = document.getElementById('messageInput');
-            const message = input.value.trim();
+            # When the agent starts asking for a doctor, let the client show the picker.
+            # The reply is already sent, so a roster that cannot be built only skips the picker.
+            if (agent.conversation_state == ConversationState.DOCTOR_SELECTION
+                    and previous_state != ConversationState.DOCTOR_SELECTION):
+                try:
+                    doctors = tuple(str(doctor) for doctor in agent.schedules_db["Doctor"].unique())
+                except Exception as e:
+                    logger.warning(f"⚠️  Skipping doctor picker: {e}")
+                else:
+                    if doctors:
+                        await manager.send_personal_message(doctor_selection_payload(doctors), websocket)
             
-            if (message && isConnected) {
-                addMessage(message, 'user');
-                input.value = '';
-                
-                // Show typing indicator
-                showTypingIndicator();
-                
-                // Send message to server
-                ws.send(JSON.stringify({
-                    type: 'message',
-                    message: message
-                }));
-            }
-        }
-        
-        function sendQuickMessage(message) {
-            if (isConnected) {
-                addMessage(message, 'user');
-                showTypingIndicator();
-                
-                ws.send(JSON.stringify({
-                    type: 'message',
-                    message: message
-                }));
-            }
-        }
-        
-        function resetConversation() {
-            if (isConnected) {
-                ws.send(JSON.stringify({
-                    type: 'reset'
-                }));
+            # If appointment is completed, send summary
+            if agent.conversation_state == ConversationState.COMPLETED and agent.current_appointment:
+                await manager.send_personal_message(
+                    json_dumps({
+                        "type": "appointment_summary",
+                        "appointment": appointment_summary(agent.current_appointment),
+                        "clientId": client_id,
+                        "ts": now_ms()
+                    }), 
+                    websocket
+                )
                 
-                // Clear chat messages except welcome
-                const chatMessages = document.getElementById('chatMessages');
-                const welcomeMessage = chatMessages.querySelector('.message.assistant');
-                chatMessages.innerHTML = '';
-                chatMessages.appendChild(welcomeMessage);
-            }
-        }
-        
-        function addMessage(content, sender, messageType = 'normal') {
-            const chatMessages = document.getElementById('chatMessages');
-            const messageDiv = document.createElement('div');
-            messageDiv.className = `message ${sender}`;
-            
-            if (sender === 'assistant' && messageType !== 'normal') {
-                messageDiv.classList.add(messageType);
-            }
-            
-            const now = new Date();
-            const timeString = now.toLocaleTimeString();
-            
-            messageDiv.innerHTML = `
-                <div class="message-content">
-                    <div>${content}</div>
-                    <div class="message-time">${timeString}</div>
-                </div>
-            `;
-            
-            chatMessages.appendChild(messageDiv);
-            chatMessages.scrollTop = chatMessages.scrollHeight;
-        }
-        
-                 function showAppointmentSummary(appointment) {
-             const chatMessages = document.getElementById('chatMessages');
-             const summaryDiv = document.createElement('div');
-             summaryDiv.className = 'appointment-summary';
-             
-             summaryDiv.innerHTML = `
-                 <h4>🎉 Appointment Confirmed!</h4>
-                 <p><strong>Patient:</strong> ${appointment.patient.first_name} ${appointment.patient.last_name}</p>
-                 <p><strong>Doctor:</strong> ${appointment.doctor}</p>
-                 <p><strong>Date:</strong> ${appointment.date}</p>
-                 <p><strong>Time:</strong> ${appointment.time}</p>
-                 <p><strong>Duration:</strong> ${appointment.duration} minutes</p>
-                 <p><strong>Type:</strong> ${appointment.patient.patient_type} Patient</p>
-             `;
-             
-             chatMessages.appendChild(summaryDiv);
-             chatMessages.scrollTop = chatMessages.scrollHeight;
-         }
-         
-         function showDoctorSelection(doctors) {
-             const chatMessages = document.getElementById('chatMessages');
-             const selectionDiv = document.createElement('div');
-             selectionDiv.className = 'doctor-selection';
-             selectionDiv.id = 'doctorSelection';
-             
-             const doctorList = doctors.split(', ').map(doctor => doctor.trim());
-             
-             selectionDiv.innerHTML = `
-                 <h4>👨‍⚕️ Select Your Doctor</h4>
-                 <div class="doctor-search">
-                     <input type="text" id="doctorSearch" placeholder="Search doctors by name..." onkeyup="filterDoctors()">
-                 </div>
-                 <div class="doctor-grid" id="doctorGrid">
-                     ${doctorList.map(doctor => `
-                         <div class="doctor-option" onclick="selectDoctor('${doctor}')" data-name="${doctor.toLowerCase()}">
-                             ${doctor}
-                         </div>
-                     `).join('')}
-                 </div>
-                 <div class="selection-actions" id="selectionActions" style="display: none; margin-top: 15px; text-align: center;">
-                     <button class="change-selection-btn" onclick="resetDoctorSelection()">🔄 Change Selection</button>
-                 </div>
-             `;
-             
-             chatMessages.appendChild(selectionDiv);
-             chatMessages.scrollTop = chatMessages.scrollHeight;
-         }
-         
-         function filterDoctors() {
-             const searchTerm = document.getElementById('doctorSearch').value.toLowerCase();
-             const doctorOptions = document.querySelectorAll('.doctor-option');
-             
-             doctorOptions.forEach(option => {
-                 const doctorName = option.getAttribute('data-name');
-                 if (doctorName.includes(searchTerm)) {
-                     option.style.display = 'block';
-                 } else {
-                     option.style.display = 'none';
-                 }
-             });
-         }
-         
-         function selectDoctor(doctorName) {
-             // Mark the selected doctor as selected
-             const doctorOptions = document.querySelectorAll('.doctor-option');
-             doctorOptions.forEach(option => {
-                 option.classList.remove('selected');
-                 if (option.textContent.trim() === doctorName) {
-                     option.classList.add('selected');
-                 }
-             });
-             
-             // Disable all other options to prevent multiple selections
-             doctorOptions.forEach(option => {
-                 if (option.textContent.trim() !== doctorName) {
-                     option.style.opacity = '0.5';
-                     option.style.cursor = 'not-allowed';
-                     option.onclick = null;
-                 }
-             });
-             
-             // Show the change selection button
-             const selectionActions = document.getElementById('selectionActions');
-             if (selectionActions) {
-                 selectionActions.style.display = 'block';
-             }
-             
-             // Add a confirmation message
-             const chatMessages = document.getElementById('chatMessages');
-             const confirmationDiv = document.createElement('div');
-             confirmationDiv.className = 'message user';
-             confirmationDiv.innerHTML = `
-                 <div class="message-content">
-                     <div>✅ Selected: ${doctorName}</div>
-                     <div class="message-time">${new Date().toLocaleTimeString()}</div>
-                 </div>
-             `;
-             chatMessages.appendChild(confirmationDiv);
-             chatMessages.scrollTop = chatMessages.scrollHeight;
-             
-             // Send doctor selection to server
-             if (isConnected) {
-                 showTypingIndicator();
-                 
-                 ws.send(JSON.stringify({
-                     type: 'message',
-                     message: doctorName
-                 }));
-             }
-         }
-         
-         function resetDoctorSelection() {
-             // Reset all doctor options
-             const doctorOptions = document.querySelectorAll('.doctor-option');
-             doctorOptions.forEach(option => {
-                 option.classList.remove('selected');
-                 option.style.opacity = '1';
-                 option.style.cursor = 'pointer';
-                 option.onclick = () => selectDoctor(option.textContent.trim());
-             });
-             
-             // Hide the change selection button
-             const selectionActions = document.getElementById('selectionActions');
-             if (selectionActions) {
-                 selectionActions.style.display = 'none';
-             }
-             
-             // Clear the search input
-             const searchInput = document.getElementById('doctorSearch');
-             if (searchInput) {
-                 searchInput.value = '';
-                 filterDoctors(); // Reset the filter
-             }
-             
-             // Add a reset message
-             const chatMessages = document.getElementById('chatMessages');
-             const resetDiv = document.createElement('div');
-             resetDiv.className = 'message user';
-             resetDiv.innerHTML = `
-                 <div class="message-content">
-                     <div>🔄 Selection reset - please choose a doctor</div>
-                     <div class="message-time">${new Date().toLocaleTimeString()}</div>
-                 </div>
-             `;
-             chatMessages.appendChild(resetDiv);
-             chatMessages.scrollTop = chatMessages.scrollHeight;
-         }
-        
-        function showTypingIndicator() {
-            document.getElementById('typingIndicator').style.display = 'block';
-            const chatMessages = document.getElementById('chatMessages');
-            chatMessages.scrollTop = chatMessages.scrollHeight;
-        }
-        
-        function hideTypingIndicator() {
-            document.getElementById('typingIndicator').style.display = 'none';
-        }
-        
-        function updateConnectionStatus(status, message) {
-            const statusElement = document.getElementById('connectionStatus');
-            statusElement.className = `connection-status ${status}`;
-            statusElement.textContent = message;
-        }
-        
-        // Event listeners
-        document.getElementById('messageInput').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') {
-                sendMessage();
-            }
-        });
-        
-        // Set welcome message time
-        document.getElementById('welcomeTime').textContent = new Date().toLocaleTimeString();
-        
-        // Connect when page loads
-        connect();
-    </script>
-</body>
-</html>
-"""
-
-@app.get("/")
-async def get():
-    return HTMLResponse(HTML_TEMPLATE)
+        except AgentReplyError as e:
+            # A streamed reply that failed part way; any partial text stays in its own bubble
+            await manager.send_personal_message(message_payload(f"❌ {e}", "error", client_id), websocket)
+        except Exception as e:
+            await manager.send_personal_message(
+                message_payload(f"❌ I apologize, but I encountered an error: {str(e)}. Please try again.", "error", client_id),
+                websocket
+            )
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    lock = manager.agent_locks[websocket]
+    slots = manager.turn_slots[websocket]
+    turns: Set[asyncio.Task] = set()
     
     try:
-        while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+        async for data in iter_frames(websocket):
+            # Also checked here for servers started without SERVER_OPTIONS;
+            # text frames are measured in characters
+            if len(data) > MAX_MESSAGE_SIZE:
+                await websocket.close(code=1009)
+                break
+            message_data = json_loads(data)
             
             if message_data.get("type") == "reset":
-                # Reset the agent for this connection
-                try:
-                    if LLM_AVAILABLE:
-                        manager.agent_instances[websocket] = LLMMedicalSchedulingAgent()
+                # Reset the agent for this connection, in place when it supports it
+                async with lock:
+                    agent = manager.agent_instances.get(websocket)
+                    if agent is not None and is_reusable(agent):
+                        await asyncio.to_thread(recycle_agent, agent)
                     else:
-                        manager.agent_instances[websocket] = LLMMedicalSchedulingAgent()
-                except Exception as e:
-                    print(f"❌ Error resetting agent: {e}")
-                    from src.agent import MedicalSchedulingAgent
-                    manager.agent_instances[websocket] = MedicalSchedulingAgent()
-                await manager.send_personal_message(
-                    json.dumps({
-                        "type": "message",
-                        "message": "🔄 Conversation reset! Hello! I'm your AI medical scheduling assistant. How can I help you today?",
-                        "message_type": "normal"
-                    }), 
-                    websocket
-                )
+                        manager.agent_instances[websocket] = await manager.acquire_agent()
+                await manager.send_personal_message(message_payload(RESET_MESSAGE), websocket)
                 continue
             
-            # Get the agent instance for this connection
-            agent = manager.agent_instances.get(websocket)
-            if not agent:
-                await manager.send_personal_message(
-                    json.dumps({
-                        "type": "message",
-                        "message": "❌ Agent not found. Please refresh the page.",
-                        "message_type": "error"
-                    }), 
-                    websocket
-                )
-                continue
-            
-            # Process the message
+            # Process the message without waiting for earlier turns to finish;
+            # a full window makes the reader wait so one client cannot pile up turns
             user_message = message_data.get("message", "")
             if user_message:
-                try:
-                    # Process through AI agent
-                    response = agent.process_message(user_message)
-                    
-                    # Determine message type
-                    message_type = "normal"
-                    if agent.conversation_state == ConversationState.COMPLETED:
-                        message_type = "success"
-                    elif "error" in response.lower() or "sorry" in response.lower():
-                        message_type = "error"
-                    
-                    # Send response
-                    await manager.send_personal_message(
-                        json.dumps({
-                            "type": "message",
-                            "message": response,
-                            "message_type": message_type
-                        }), 
-                        websocket
-                    )
-                    
-                    # If appointment is completed, send summary
-                    if agent.conversation_state == ConversationState.COMPLETED and agent.current_appointment:
-                        appointment_data = {
-                            "patient": {
-                                "first_name": agent.current_appointment.patient.first_name,
-                                "last_name": agent.current_appointment.patient.last_name,
-                                "patient_type": agent.current_appointment.patient.patient_type
-                            },
-                            "doctor": agent.current_appointment.doctor,
-                            "date": agent.current_appointment.date,
-                            "time": agent.current_appointment.time,
-                            "duration": agent.current_appointment.duration
-                        }
-                        
-                        await manager.send_personal_message(
-                            json.dumps({
-                                "type": "appointment_summary",
-                                "appointment": appointment_data
-                            }), 
-                            websocket
-                        )
-                        
-                except Exception as e:
-                    await manager.send_personal_message(
-                        json.dumps({
-                            "type": "message",
-                            "message": f"❌ I apologize, but I encountered an error: {str(e)}. Please try again.",
-                            "message_type": "error"
-                        }), 
-                        websocket
-                    )
+                await slots.acquire()
+                task = asyncio.create_task(
+                    handle_turn(websocket, lock, user_message, message_data.get("clientId"))
+                )
+                turns.add(task)
+                task.add_done_callback(turns.discard)
+                task.add_done_callback(lambda _: slots.release())
     
-    except WebSocketDisconnect:
+    finally:
         manager.disconnect(websocket)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "connections": len(manager.active_connections)}
+    # Connections are counted per worker process; "worker" identifies which one answered
+    return {"status": "healthy", "connections": len(manager.active_connections), "worker": os.getpid()}
+
+# Serve static/index.html at "/". Mounted last so it does not shadow /ws or /health.
+app.mount("/", StaticFiles(directory=STATIC_DIR, html=True), name="index")
 
 if __name__ == "__main__":
     print("🚀 Starting RagaAI Medical Scheduling Agent Web UI...")
     print("📱 Open your browser and go to: http://localhost:8000")
     print("🔌 WebSocket endpoint: ws://localhost:8000/ws")
     print("💡 Press Ctrl+C to stop the server")
+    if SERVER_OPTIONS["ws"] == "websockets" and not find_spec("websockets.speedups"):
+        print("⚠️  websockets was installed without its C speedups; frame masking will use pure Python")
     
     uvicorn.run(
         "chatbot_ui:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        log_level="info",
+        **SERVER_OPTIONS
     )
 
@@ -3,8 +3,25 @@ Configuration file for RagaAI Medical Scheduling Agent
 """
 
 import os
+from dataclasses import dataclass, asdict
 from typing import Dict, Any
 
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    """SMTP settings for reminder and confirmation emails"""
+    smtp_server: str
+    smtp_port: int
+    email: str
+    password: str
+    from_name: str = "RagaAI Medical Scheduling"
+
+@dataclass(frozen=True, slots=True)
+class SmsConfig:
+    """Twilio settings for SMS reminders"""
+    account_sid: str
+    auth_token: str
+    from_number: str
+
 class Config:
     """Application configuration"""
     
@@ -50,25 +67,18 @@ class Config:
     BUSINESS_END_HOUR = 17
     BUSINESS_DAYS = [0, 1, 2, 3, 4]  # Monday to Friday
     
+    # Directories already created by ensure_directories in this process
+    _ensured = set()
+    
     @classmethod
     def get_email_config(cls) -> Dict[str, Any]:
-        """Get email configuration"""
-        return {
-            "smtp_server": cls.SMTP_SERVER,
-            "smtp_port": cls.SMTP_PORT,
-            "email": cls.EMAIL_ADDRESS,
-            "password": cls.EMAIL_PASSWORD,
-            "from_name": "RagaAI Medical Scheduling"
-        }
+        """Get email configuration as a dict (prefer the EMAIL_CFG instance)"""
+        return asdict(EMAIL_CFG)
     
     @classmethod
     def get_sms_config(cls) -> Dict[str, Any]:
-        """Get SMS configuration"""
-        return {
-            "account_sid": cls.TWILIO_ACCOUNT_SID,
-            "auth_token": cls.TWILIO_AUTH_TOKEN,
-            "from_number": cls.TWILIO_FROM_NUMBER
-        }
+        """Get SMS configuration as a dict (prefer the SMS_CFG instance)"""
+        return asdict(SMS_CFG)
     
     @classmethod
     def get_llm_config(cls) -> Dict[str, Any]:
@@ -81,8 +91,24 @@ class Config:
     
     @classmethod
     def ensure_directories(cls):
-        """Ensure all required directories exist"""
+        """Ensure all required directories exist (only the first call touches the filesystem)"""
         directories = [cls.DATA_DIR, cls.EXPORTS_DIR, cls.BACKUPS_DIR, cls.FORMS_DIR]
         for directory in directories:
+            if directory in cls._ensured:
+                continue
             os.makedirs(directory, exist_ok=True)
+            cls._ensured.add(directory)
+
+# Built once at import; shared, immutable configuration objects
+EMAIL_CFG = EmailConfig(
+    smtp_server=Config.SMTP_SERVER,
+    smtp_port=Config.SMTP_PORT,
+    email=Config.EMAIL_ADDRESS,
+    password=Config.EMAIL_PASSWORD
+)
 
+SMS_CFG = SmsConfig(
+    account_sid=Config.TWILIO_ACCOUNT_SID,
+    auth_token=Config.TWILIO_AUTH_TOKEN,
+    from_number=Config.TWILIO_FROM_NUMBER
+)
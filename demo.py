@@ -6,10 +6,118 @@ Shows complete functionality and features
 import streamlit as st
 import pandas as pd
 import os
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from openpyxl import load_workbook
 from src.agent import MedicalSchedulingAgent
 from src.data_generator import MedicalDataGenerator
 from src.excel_export import excel_exporter
-from src.utils import get_system_stats
+from src.utils import get_system_stats, read_excel_fast, PARQUET_AVAILABLE
+
+# Rows shown per table preview
+PAGE_SIZE = 10
+
+@st.cache_data(show_spinner=False)
+def count_csv_rows(path, mtime):
+    """Number of data rows in a CSV; only the first column is parsed"""
+    return len(pd.read_csv(path, usecols=[0]))
+
+def read_csv_page(path, page):
+    """Read one PAGE_SIZE page of a CSV without loading the rest of the file"""
+    start = page * PAGE_SIZE
+    return pd.read_csv(path, skiprows=range(1, start + 1), nrows=PAGE_SIZE)
+
+@st.cache_data(show_spinner=False)
+def read_excel_head(path, mtime, rows=PAGE_SIZE):
+    """First rows of a workbook's active sheet and its data row count, read in read-only mode.
+
+    Cached per file version like count_csv_rows, so reruns do not re-read the table.
+    """
+    if PARQUET_AVAILABLE:
+        # The Parquet copy loads faster than even a partial workbook read
+        df = read_excel_fast(path)
+        return df.head(rows), len(df)
+    workbook = load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.active
+        values = sheet.iter_rows(values_only=True)
+        header = next(values, ())
+        head = pd.DataFrame(list(islice(values, rows)), columns=header)
+        return head, max((sheet.max_row or 1) - 1, 0)
+    finally:
+        workbook.close()
+
+# Files get_system_stats reads; their mtimes key the cached stats
+STATS_FILES = ("data/patients.csv", "data/appointments.xlsx", "data/schedules.xlsx")
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_system_stats(mtimes):
+    return get_system_stats()
+
+def data_mtimes(paths):
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+@st.cache_resource
+def report_executor():
+    """Worker threads for report exports, shared by every session for the server's lifetime"""
+    return ThreadPoolExecutor(max_workers=2)
+
+def submit_report(key, label, export, *args):
+    """Run an export on the shared worker threads instead of the script thread"""
+    jobs = st.session_state.setdefault('report_jobs', {})
+    if key in jobs and not jobs[key][0].done():
+        return  # Already running
+    jobs[key] = (report_executor().submit(export, *args), label)
+
+def show_report_jobs():
+    """List running exports and the results of finished ones; returns True while any are running.
+
+    Finished results stay in session state until dismissed, so a polling rerun does not
+    wipe a message that was only just shown.
+    """
+    jobs = st.session_state.get('report_jobs', {})
+    results = st.session_state.setdefault('report_results', [])
+    running = False
+    for key, (future, label) in list(jobs.items()):
+        if not future.done():
+            st.info(f"⏳ {label} in progress...")
+            running = True
+            continue
+        del jobs[key]
+        results.append((label, None if future.exception() else future.result()))
+    
+    for label, path in results:
+        if path:
+            st.success(f"✅ {label} exported: {path}")
+        else:
+            st.error(f"❌ Failed to export {label.lower()}")
+    if results and st.button("✖️ Dismiss report messages", key="dismiss_report_results"):
+        results.clear()
+        st.rerun()
+    return running
+
+def report_status_panel():
+    """Report job status and the latest exports"""
+    show_report_jobs()
+    
+    # Show export list
+    st.subheader("📁 Generated Reports")
+    exports = excel_exporter.get_recent_exports(5)
+    if exports:
+        for export in exports:
+            st.write(f"📄 {export['filename']} - {export['modified']}")
+    else:
+        st.info("No reports generated yet")
+
+@st.fragment(run_every=1)
+def poll_report_status():
+    """Status panel that refreshes itself every second while exports are running"""
+    jobs = st.session_state.get('report_jobs', {})
+    if all(future.done() for future, _ in jobs.values()):
+        # Finish with one full rerun, which draws the plain panel and stops the polling
+        st.rerun()
+    report_status_panel()
 
 def main():
     """Main demo function"""
@@ -22,27 +130,30 @@ def main():
     st.title("🏥 RagaAI Medical Scheduling Agent - Demo")
     st.markdown("---")
     
-    # Initialize data if needed
-    if not os.path.exists("data/patients.csv"):
-        with st.spinner("Initializing synthetic data..."):
-            generator = MedicalDataGenerator()
-            generator.create_data_files()
-        st.success("✅ Data initialized!")
+    # Initialize data if needed; checked once per session, not on every rerun
+    if not st.session_state.get('data_initialized'):
+        if not os.path.exists("data/patients.csv"):
+            with st.spinner("Initializing synthetic data..."):
+                generator = MedicalDataGenerator()
+                generator.create_data_files()
+            st.success("✅ Data initialized!")
+        st.session_state.data_initialized = True
     
     # Display system overview
+    stats = cached_system_stats(data_mtimes(STATS_FILES))
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Total Patients", get_system_stats()['patients'])
+        st.metric("📊 Total Patients", stats['patients'])
     
     with col2:
-        st.metric("📅 Total Appointments", get_system_stats()['appointments'])
+        st.metric("📅 Total Appointments", stats['appointments'])
     
     with col3:
-        st.metric("👨‍⚕️ Available Doctors", get_system_stats()['doctors'])
+        st.metric("👨‍⚕️ Available Doctors", stats['doctors'])
     
     with col4:
-        st.metric("⏰ Available Slots", get_system_stats()['available_slots'])
+        st.metric("⏰ Available Slots", stats['available_slots'])
     
     st.markdown("---")
     
@@ -61,6 +172,7 @@ def main():
         # Initialize agent
         if 'demo_agent' not in st.session_state:
             st.session_state.demo_agent = MedicalSchedulingAgent()
+        agent = st.session_state.demo_agent
         
         # Demo conversation
         demo_messages = [
@@ -75,22 +187,27 @@ def main():
         ]
         
         if st.button("🎬 Start Demo Conversation"):
-            st.session_state.demo_agent.reset_conversation()
+            agent.reset_conversation()
+            
+            # Run the whole conversation first, then render it in one pass
+            results = []
+            for message in demo_messages:
+                response = agent.process_message(message)
+                results.append((message, response, agent.conversation_state.value))
             
-            for i, message in enumerate(demo_messages):
+            for i, (message, response, state) in enumerate(results):
                 with st.expander(f"Step {i+1}: {message}"):
-                    response = st.session_state.demo_agent.process_message(message)
                     st.write(f"**AI Response:** {response}")
-                    st.write(f"**State:** {st.session_state.demo_agent.conversation_state.value}")
+                    st.write(f"**State:** {state}")
         
         # Manual conversation
         st.subheader("💬 Try It Yourself")
         user_input = st.text_input("Type your message:", placeholder="e.g., Hi, I need an appointment")
         
         if st.button("Send") and user_input:
-            response = st.session_state.demo_agent.process_message(user_input)
+            response = agent.process_message(user_input)
             st.write(f"**AI:** {response}")
-            st.write(f"**Current State:** {st.session_state.demo_agent.conversation_state.value}")
+            st.write(f"**Current State:** {agent.conversation_state.value}")
     
     with tab2:
         st.header("📊 Data Overview")
@@ -100,30 +217,34 @@ def main():
         with col1:
             st.subheader("👥 Patients Database")
             try:
-                patients_df = pd.read_csv("data/patients.csv")
-                st.dataframe(patients_df.head(10), use_container_width=True)
-                st.caption(f"Showing 10 of {len(patients_df)} patients")
+                patients_file = "data/patients.csv"
+                total_patients = count_csv_rows(patients_file, os.path.getmtime(patients_file))
+                pages = max((total_patients + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+                page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="patients_page")
+                patients_df = read_csv_page(patients_file, page - 1)
+                st.dataframe(patients_df, use_container_width=True)
+                st.caption(f"Showing page {page} of {pages} ({total_patients} patients)")
             except Exception as e:
                 st.error(f"Could not load patients: {str(e)}")
         
         with col2:
             st.subheader("📅 Appointments")
             try:
-                appointments_df = pd.read_excel("data/appointments.xlsx")
-                st.dataframe(appointments_df.head(10), use_container_width=True)
-                st.caption(f"Showing 10 of {len(appointments_df)} appointments")
+                appointments_df, total_appointments = read_excel_head("data/appointments.xlsx", os.path.getmtime("data/appointments.xlsx"))
+                st.dataframe(appointments_df, use_container_width=True)
+                st.caption(f"Showing {len(appointments_df)} of {total_appointments} appointments")
             except Exception as e:
                 st.error(f"Could not load appointments: {str(e)}")
         
         st.subheader("🏥 Doctor Schedules")
         try:
             try:
-                schedules_df = pd.read_excel("data/schedules.xlsx")
+                schedules_df, total_schedules = read_excel_head("data/schedules.xlsx", os.path.getmtime("data/schedules.xlsx"))
             except PermissionError:
-                schedules_df = pd.read_excel("data/schedules_new.xlsx")
+                schedules_df, total_schedules = read_excel_head("data/schedules_new.xlsx", os.path.getmtime("data/schedules_new.xlsx"))
             
-            st.dataframe(schedules_df.head(10), use_container_width=True)
-            st.caption(f"Showing 10 of {len(schedules_df)} schedule entries")
+            st.dataframe(schedules_df, use_container_width=True)
+            st.caption(f"Showing {len(schedules_df)} of {total_schedules} schedule entries")
         except Exception as e:
             st.error(f"Could not load schedules: {str(e)}")
     
@@ -134,48 +255,26 @@ def main():
         
         with col1:
             if st.button("📊 Generate Appointments Report"):
-                with st.spinner("Generating report..."):
-                    report_path = excel_exporter.export_appointments_report()
-                    if report_path:
-                        st.success(f"✅ Report generated: {report_path}")
-                    else:
-                        st.error("❌ Failed to generate report")
+                submit_report("appointments", "Appointments report", excel_exporter.export_appointments_report)
             
             if st.button("👥 Export Patient Database"):
-                with st.spinner("Exporting database..."):
-                    db_path = excel_exporter.export_patient_database()
-                    if db_path:
-                        st.success(f"✅ Database exported: {db_path}")
-                    else:
-                        st.error("❌ Failed to export database")
+                submit_report("patients", "Patient database", excel_exporter.export_patient_database)
         
         with col2:
             if st.button("💰 Generate Revenue Report"):
-                with st.spinner("Generating revenue report..."):
-                    revenue_path = excel_exporter.export_revenue_report()
-                    if revenue_path:
-                        st.success(f"✅ Revenue report generated: {revenue_path}")
-                    else:
-                        st.error("❌ Failed to generate revenue report")
+                submit_report("revenue", "Revenue report", excel_exporter.export_revenue_report)
             
             if st.button("📅 Export Today's Schedule"):
-                import datetime
                 today = datetime.date.today().strftime("%Y-%m-%d")
-                with st.spinner("Exporting today's schedule..."):
-                    schedule_path = excel_exporter.export_daily_schedule(today)
-                    if schedule_path:
-                        st.success(f"✅ Schedule exported: {schedule_path}")
-                    else:
-                        st.error("❌ Failed to export schedule")
+                submit_report("schedule", "Today's schedule", excel_exporter.export_daily_schedule, today)
         
-        # Show export list
-        st.subheader("📁 Generated Reports")
-        exports = excel_exporter.get_export_list()
-        if exports:
-            for export in exports[:5]:  # Show last 5 exports
-                st.write(f"📄 {export['filename']} - {export['modified']}")
+        # Exports run in the background. While any are running the status panel polls
+        # on its own as a fragment, so the rest of the page is not rerun.
+        reports_running = any(not future.done() for future, _ in st.session_state.get('report_jobs', {}).values())
+        if reports_running:
+            poll_report_status()
         else:
-            st.info("No reports generated yet")
+            report_status_panel()
     
     with tab4:
         st.header("⚙️ Configuration")
@@ -4,9 +4,10 @@ Ollama Installation Script for Windows
 This script will guide you through installing Ollama and setting up a free LLM
 """
 
+import socket
 import subprocess
 import sys
-import requests
+import threading
 import time
 import os
 
@@ -56,15 +57,19 @@ def install_ollama():
         print("❌ Ollama installation not detected. Please restart your terminal and try again.")
         return False
 
-def check_ollama_running():
-    """Check if Ollama service is running"""
+def ollama_port_open():
+    """Whether anything is listening on Ollama's port; a refused connect returns at once"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        if response.status_code == 200:
-            print("✅ Ollama service is running!")
+        with socket.create_connection(("127.0.0.1", 11434), timeout=0.2):
             return True
-    except:
-        pass
+    except OSError:
+        return False
+
+def check_ollama_running():
+    """Check if Ollama service is running"""
+    if ollama_port_open():
+        print("✅ Ollama service is running!")
+        return True
     return False
 
 def start_ollama():
@@ -76,13 +81,14 @@ def start_ollama():
                         stdout=subprocess.DEVNULL, 
                         stderr=subprocess.DEVNULL)
         
-        # Wait for service to start
+        # Wait up to 20 seconds for the service to start, checking every 100 ms
         print("   Waiting for Ollama to start...")
-        for i in range(10):
-            time.sleep(2)
+        for i in range(200):
+            time.sleep(0.1)
             if check_ollama_running():
                 return True
-            print(f"   Attempt {i+1}/10...")
+            if (i + 1) % 20 == 0:
+                print(f"   Still waiting ({(i + 1) // 10}s)...")
         
         print("❌ Ollama service failed to start")
         return False
@@ -90,6 +96,36 @@ def start_ollama():
         print(f"❌ Error starting Ollama: {e}")
         return False
 
+def run_streaming(command, timeout=None):
+    """Run a command, echoing its output as it arrives instead of buffering it
+    
+    Returns (returncode, timed_out). The process is killed after `timeout` seconds.
+    """
+    # Text mode splits on "\r" too, so each progress bar update arrives as a line
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        process.kill()
+    
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        for line in process.stdout:
+            line = line.strip()
+            if line:
+                # Overwrite the previous line so progress updates stay on one row
+                print(f"\r   {line[:100]:<100}", end="", flush=True)
+        print()
+        process.wait()
+    finally:
+        if timer:
+            timer.cancel()
+    return process.returncode, timed_out.is_set()
+
 def download_model():
     """Download a free LLM model"""
     print("📦 Downloading free LLM model...")
@@ -112,13 +148,12 @@ def download_model():
     print("   This may take several minutes depending on your internet speed...")
     
     try:
-        result = subprocess.run(['ollama', 'pull', model], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
+        returncode, _ = run_streaming(['ollama', 'pull', model])
+        if returncode == 0:
             print(f"✅ Successfully downloaded {model}!")
             return True
         else:
-            print(f"❌ Error downloading model: {result.stderr}")
+            print(f"❌ Error downloading model (exit code {returncode})")
             return False
     except Exception as e:
         print(f"❌ Error downloading model: {e}")
@@ -128,18 +163,17 @@ def test_ollama():
     """Test Ollama with a simple query"""
     print("🧪 Testing Ollama...")
     try:
-        result = subprocess.run(['ollama', 'run', 'llama3.1:8b', 'Hello, how are you?'], 
-                              capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
+        returncode, timed_out = run_streaming(['ollama', 'run', 'llama3.1:8b', 'Hello, how are you?'],
+                                              timeout=30)
+        if timed_out:
+            print("⏰ Ollama test timed out (this is normal for first run)")
+            return True
+        if returncode == 0:
             print("✅ Ollama is working correctly!")
-            print(f"   Response: {result.stdout.strip()[:100]}...")
             return True
         else:
-            print(f"❌ Ollama test failed: {result.stderr}")
+            print(f"❌ Ollama test failed (exit code {returncode})")
             return False
-    except subprocess.TimeoutExpired:
-        print("⏰ Ollama test timed out (this is normal for first run)")
-        return True
     except Exception as e:
         print(f"❌ Error testing Ollama: {e}")
         return False
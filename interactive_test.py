@@ -46,9 +46,9 @@ def main():
             # Process through agent
             response = agent.process_message(user_input)
             
-            # Display response
-            print(f"AI: {response}")
-            print(f"State: {agent.conversation_state.value}")
+            # Display response in a single write
+            sys.stdout.write(f"AI: {response}\nState: {agent.conversation_state.value}\n")
+            sys.stdout.flush()
             
             # Check if conversation is complete
             if agent.conversation_state == ConversationState.COMPLETED:
@@ -72,23 +72,28 @@ def main():
             print(f"❌ Error: {str(e)}")
             print("Type 'reset' to start over or 'quit' to exit")
 
+HELP_TEXT = """
+📋 Help - Example Conversation Flow:
+----------------------------------------
+1. 'Hi, I'd like to book an appointment'
+2. 'My name is John'
+3. 'My DOB is 01/15/1990'
+4. 'I'd like to see Dr. Sarah Johnson'
+5. 'I'll take slot 1'
+6. 'My insurance is Blue Cross Blue Shield'
+7. 'My member ID is BC123456789'
+8. 'My group number is GRP001'
+
+Commands:
+- 'quit': Exit the program
+- 'reset': Start a new conversation
+- 'status': Show current conversation state
+- 'help': Show this help message
+"""
+
 def print_help():
     """Print help information"""
-    print("\n📋 Help - Example Conversation Flow:")
-    print("-" * 40)
-    print("1. 'Hi, I'd like to book an appointment'")
-    print("2. 'My name is John'")
-    print("3. 'My DOB is 01/15/1990'")
-    print("4. 'I'd like to see Dr. Sarah Johnson'")
-    print("5. 'I'll take slot 1'")
-    print("6. 'My insurance is Blue Cross Blue Shield'")
-    print("7. 'My member ID is BC123456789'")
-    print("8. 'My group number is GRP001'")
-    print("\nCommands:")
-    print("- 'quit': Exit the program")
-    print("- 'reset': Start a new conversation")
-    print("- 'status': Show current conversation state")
-    print("- 'help': Show this help message")
+    print(HELP_TEXT, end="")
 
 def print_status(agent):
     """Print current conversation status"""
@@ -110,18 +115,22 @@ def print_appointment_summary(agent):
         appointment = agent.current_appointment
         patient = appointment.patient
         
-        print(f"\n📋 Appointment Summary:")
-        print(f"Patient: {patient.first_name} {patient.last_name}")
-        print(f"Type: {patient.patient_type}")
-        print(f"Doctor: {appointment.doctor}")
-        print(f"Date: {appointment.date}")
-        print(f"Time: {appointment.time}")
-        print(f"Duration: {appointment.duration} minutes")
+        lines = [
+            "\n📋 Appointment Summary:",
+            f"Patient: {patient.first_name} {patient.last_name}",
+            f"Type: {patient.patient_type}",
+            f"Doctor: {appointment.doctor}",
+            f"Date: {appointment.date}",
+            f"Time: {appointment.time}",
+            f"Duration: {appointment.duration} minutes"
+        ]
         
         if appointment.insurance:
-            print(f"Insurance: {appointment.insurance.carrier}")
-            print(f"Member ID: {appointment.insurance.member_id}")
-            print(f"Group: {appointment.insurance.group_number}")
+            lines.append(f"Insurance: {appointment.insurance.carrier}")
+            lines.append(f"Member ID: {appointment.insurance.member_id}")
+            lines.append(f"Group: {appointment.insurance.group_number}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     main()
@@ -1,31 +1,105 @@
 import streamlit as st
 import pandas as pd
 import os
+import csv
 import datetime
-from src.utils import send_intake_form
+from openpyxl import load_workbook
+from src.utils import send_intake_form, read_excel_fast, PARQUET_AVAILABLE
+
+# Load data once per file version; Streamlit reruns this script on every widget change.
+# The mtime argument is part of the cache key, so saving a file invalidates its entry.
+@st.cache_data(show_spinner=False)
+def load_patients(path, mtime):
+    return pd.read_csv(path)
+
+@st.cache_data(show_spinner=False)
+def load_available_slots(path, mtime):
+    """Map each doctor to their available "Date Time" slots, filtered while streaming the sheet"""
+    slots = {}
+    if PARQUET_AVAILABLE:
+        schedules = read_excel_fast(path)
+        for doctor in schedules["Doctor"].unique():
+            slots[doctor] = []
+        available = schedules[schedules["Available"] == "Yes"]
+        # Build every "Date Time" label in one vectorized concat, then split by doctor
+        labels = available["Date"].astype(str) + " " + available["Time"].astype(str)
+        slots.update(labels.groupby(available["Doctor"], sort=False).agg(list).to_dict())
+        return slots
+    workbook = load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        doctor_col, date_col, time_col, available_col = (
+            header.index(column) for column in ("Doctor", "Date", "Time", "Available")
+        )
+        for row in rows:
+            doctor_slots = slots.setdefault(row[doctor_col], [])
+            if row[available_col] == "Yes":
+                doctor_slots.append(f"{row[date_col]} {row[time_col]}")
+    finally:
+        workbook.close()
+    return slots
+
+@st.cache_data(show_spinner=False)
+def load_patient_index(path, mtime):
+    """Map (lowercase first name, DOB) to the row position of the first matching patient"""
+    patients = load_patients(path, mtime)
+    index = {}
+    for position, key in enumerate(zip(patients["FirstName"].str.lower(), patients["DOB"].astype(str))):
+        index.setdefault(key, position)
+    return index
+
+def save_appointment(path, appointment):
+    """Add one booking to the shared appointments workbook, adding any new columns to its header.
+
+    xlsx has no append mode, so openpyxl still loads and rewrites the whole file; it
+    skips the pandas DataFrame round trip the old concat did, nothing more.
+    """
+    if not os.path.exists(path):
+        pd.DataFrame([appointment]).to_excel(path, index=False)
+        return
+    workbook = load_workbook(path)
+    try:
+        sheet = workbook.active
+        header = [cell.value for cell in sheet[1]]
+        for column in appointment:
+            if column not in header:
+                header.append(column)
+                sheet.cell(row=1, column=len(header), value=column)
+        sheet.append([appointment.get(column) for column in header])
+        workbook.save(path)
+    finally:
+        workbook.close()
 
-# Load data
 patients_file = "data/patients.csv"
-patients = pd.read_csv(patients_file)
-schedules = pd.read_excel("data/schedules.xlsx")
+schedules_file = "data/schedules.xlsx"
+# Shared with the agents, exporters, stats and backups; keep a single store
+appointments_file = "data/appointments.xlsx"
+patients_mtime = os.path.getmtime(patients_file)
+patients = load_patients(patients_file, patients_mtime)
+patient_index = load_patient_index(patients_file, patients_mtime)
+available_slots_by_doctor = load_available_slots(schedules_file, os.path.getmtime(schedules_file))
 
 st.title("AI Scheduling Agent")
 
 # Step 1: Patient info
 st.subheader("Patient Lookup")
-name = st.text_input("Enter your first name")
-dob = st.date_input(
-    "Enter your Date of Birth",
-    min_value=datetime.date.today().replace(year=datetime.date.today().year - 100),
-    max_value=datetime.date.today()
-)
-if st.button("Find Patient"):
-    match = patients[(patients["FirstName"].str.lower() == name.lower()) &
-                     (patients["DOB"] == str(dob))]
-
-    if not match.empty:
+# Inside a form, typing does not rerun the script; only the submit button does
+with st.form("lookup"):
+    name = st.text_input("Enter your first name")
+    dob = st.date_input(
+        "Enter your Date of Birth",
+        min_value=datetime.date.today().replace(year=datetime.date.today().year - 100),
+        max_value=datetime.date.today()
+    )
+    find_patient = st.form_submit_button("Find Patient")
+
+if find_patient:
+    match = patient_index.get((name.lower(), str(dob)))
+
+    if match is not None:
         # Existing patient
-        st.session_state["patient"] = match.iloc[0].to_dict()
+        st.session_state["patient"] = patients.iloc[match].to_dict()
         st.success(f"Welcome back, {name}! You are a Returning patient.")
     else:
         # Mark as new patient (so inputs show below)
@@ -35,50 +109,44 @@ if st.button("Find Patient"):
 if st.session_state.get("patient_not_found", False) and "patient" not in st.session_state:
     st.subheader("📝 New Patient Registration")
 
-    # persist values across reruns
-    if "new_email" not in st.session_state:
-        st.session_state["new_email"] = ""
-    if "new_phone" not in st.session_state:
-        st.session_state["new_phone"] = ""
-
-    st.session_state["new_email"] = st.text_input(
-        "Enter your email address", value=st.session_state["new_email"]
-    )
-    st.session_state["new_phone"] = st.text_input(
-        "Enter your phone number", value=st.session_state["new_phone"]
-    )
+    with st.form("register"):
+        new_email = st.text_input("Enter your email address")
+        new_phone = st.text_input("Enter your phone number")
+        register = st.form_submit_button("Register")
 
-    if st.session_state["new_email"]:  # only register once email is filled
+    if register and not new_email:
+        st.warning("Please enter your email address to register.")
+    elif register:
         new_patient = {
             "PatientID": len(patients) + 1,
             "FirstName": name,
             "LastName": "",
             "DOB": str(dob),
-            "Phone": st.session_state["new_phone"],
-            "Email": st.session_state["new_email"],
+            "Phone": new_phone,
+            "Email": new_email,
             "PatientType": "New"
         }
         st.session_state["patient"] = new_patient
-        st.success(f"{name} registered as a New patient with email {st.session_state['new_email']}.")
+        st.success(f"{name} registered as a New patient with email {new_email}.")
 
-        # Save new patient to CSV
-        patients = pd.concat([patients, pd.DataFrame([new_patient])], ignore_index=True)
-        patients.to_csv(patients_file, index=False)
+        # Save new patient to CSV: append one line in the file's column order.
+        # The new mtime makes the cached loads pick it up on the next rerun.
+        with open(patients_file, "a", newline="") as f:
+            csv.writer(f).writerow([new_patient.get(column, "") for column in patients.columns])
 
 # Step 2: Doctor slot selection
 if "patient" in st.session_state:
     st.subheader("Schedule Appointment")
-    doctor = st.selectbox("Choose Doctor", schedules["Doctor"].unique())
-    available_slots = schedules[(schedules["Doctor"] == doctor) &
-                                (schedules["Available"] == "Yes")]
-
-    if not available_slots.empty:
-        slot = st.selectbox(
-            "Available Slots", 
-            [f"{row['Date']} {row['Time']}" for _, row in available_slots.iterrows()]
-        )
+    doctor = st.selectbox("Choose Doctor", list(available_slots_by_doctor))
+    available_slots = available_slots_by_doctor[doctor]
 
-        if st.button("Confirm Appointment"):
+    if available_slots:
+        # The doctor picker stays outside the form so the slot list follows it
+        with st.form("schedule"):
+            slot = st.selectbox("Available Slots", available_slots)
+            confirm_appointment = st.form_submit_button("Confirm Appointment")
+
+        if confirm_appointment:
             new_appt = {
                 "PatientName": st.session_state["patient"]["FirstName"],
                 "DOB": st.session_state["patient"]["DOB"],
@@ -87,14 +155,8 @@ if "patient" in st.session_state:
                 "Status": "Confirmed"
             }
 
-            # Save appointment
-            appt_file = "data/appointments.xlsx"
-            if os.path.exists(appt_file):
-                appts = pd.read_excel(appt_file)
-                appts = pd.concat([appts, pd.DataFrame([new_appt])], ignore_index=True)
-            else:
-                appts = pd.DataFrame([new_appt])
-            appts.to_excel(appt_file, index=False)
+            # Save appointment into the workbook every other reader uses
+            save_appointment(appointments_file, new_appt)
 
             st.success(f"Appointment confirmed for {new_appt['PatientName']} with {doctor} at {slot}. ✅")
             st.info("Saved to appointments.xlsx")
@@ -119,3 +181,4 @@ if "patient" in st.session_state:
                 st.write(r)
     else:
         st.error("No available slots for this doctor.")
+
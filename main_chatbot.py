@@ -6,13 +6,24 @@ Main Streamlit application with conversational AI interface
 import streamlit as st
 import pandas as pd
 import datetime
+import json
 import os
+import re
+import textwrap
+import time
+import uuid
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from config import Config
+from src.gemini_client import GeminiClient
 from src.multi_agent_system import MultiAgentMedicalSchedulingSystem
+from src.multi_agent_coordinator import load_databases
 from src.agent import ConversationState
-from src.data_generator import MedicalDataGenerator
-from src.reminder_system import reminder_system
-from src.excel_export import excel_exporter
-from src.utils import send_intake_form
+from src.utils import send_intake_form, read_excel_fast
+# The data generator, exporter and reminder system are imported where they are used,
+# so their dependencies (openpyxl, xlsxwriter, twilio) load only when first needed
 
 # Page configuration
 st.set_page_config(
@@ -22,188 +33,152 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better UI
-st.markdown("""
-<style>
-    /* Main header styling */
-    .main-header {
-        font-size: 2.5rem;
-        color: #1a365d;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: bold;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Chat message containers */
-    .chat-message {
-        padding: 1.2rem;
-        border-radius: 12px;
-        margin: 0.8rem 0;
-        border-left: 5px solid;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        font-size: 1rem;
-        line-height: 1.5;
-    }
-    
-    /* User messages */
-    .user-message {
-        background: linear-gradient(135deg, #2d3748 0%, #4a5568 100%);
-        color: white;
-        border-left-color: #2d3748;
-        margin-left: 20%;
-        text-align: right;
-    }
-    
-    /* Assistant messages */
-    .assistant-message {
-        background: linear-gradient(135deg, #1a202c 0%, #2d3748 100%);
-        color: white;
-        border-left-color: #1a202c;
-        margin-right: 20%;
-        text-align: left;
-    }
-    
-    /* Success messages */
-    .success-message {
-        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        color: white;
-        border-left-color: #00bcd4;
-        font-weight: bold;
-    }
-    
-    /* Error messages */
-    .error-message {
-        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-        color: white;
-        border-left-color: #f44336;
-        font-weight: bold;
-    }
-    
-    /* Loading messages */
-    .loading-message {
-        background: linear-gradient(135deg, #4a5568 0%, #2d3748 100%);
-        color: white;
-        border-left-color: #4a5568;
-        font-style: italic;
-    }
-    
-    .loading-dots {
-        display: inline-block;
-    }
-    
-    .loading-dots::after {
-        content: '';
-        animation: dots 1.5s steps(4, end) infinite;
-    }
-    
-    @keyframes dots {
-        0%, 20% { content: ''; }
-        40% { content: '.'; }
-        60% { content: '..'; }
-        80%, 100% { content: '...'; }
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 8px;
-        border: none;
-        padding: 0.6rem 1.2rem;
-        font-weight: bold;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #5a6fd8 0%, #6a4190 100%);
-        color: white;
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0,0,0,0.3);
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #f8f9fa 0%, #e9ecef 100%);
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Text input styling */
-    .stTextInput > div > div > input {
-        border-radius: 8px;
-        border: 2px solid #e0e0e0;
-        padding: 0.8rem;
-        font-size: 1rem;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #667eea;
-        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-    }
-    
-    /* Metric cards */
-    .metric-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        border-left: 4px solid #667eea;
-    }
-    
-    /* Info boxes */
-    .stAlert {
-        border-radius: 8px;
-        border: none;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Dataframe styling */
-    .stDataFrame {
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #f1f1f1;
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: #667eea;
-        border-radius: 4px;
+# Custom CSS for better UI, kept in static/main_chatbot.css. With static serving enabled
+# (.streamlit/config.toml) each rerun sends a one-line <link> instead of the whole stylesheet
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "main_chatbot.css")
+
+@st.cache_data(show_spinner=False)
+def _page_css(path, mtime):
+    with open(path, encoding="utf-8") as css_file:
+        return css_file.read()
+
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<link rel="stylesheet" href="app/static/main_chatbot.css">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{_page_css(CSS_PATH, os.path.getmtime(CSS_PATH))}</style>", unsafe_allow_html=True)
+
+# Parse workbooks with the Rust-backed calamine reader when installed (pandas >= 2.2)
+EXCEL_ENGINE = "calamine" if find_spec("python_calamine") else None
+# pyarrow's CSV reader parses on several threads; pandas' C parser is single-threaded
+CSV_ENGINE = "pyarrow" if find_spec("pyarrow") else None
+
+# Load data once per file version; Streamlit reruns this script on every widget change.
+# The mtime argument is part of the cache key, so saving a file invalidates its entry.
+@st.cache_data(show_spinner=False)
+def _load_patients(path, mtime):
+    # PatientType only ever holds "New" or "Returning"; as a category it is stored as int8 codes
+    return pd.read_csv(path, engine=CSV_ENGINE, dtype={'PatientType': 'category'})
+
+@st.cache_data(show_spinner=False)
+def _patient_counts(path, mtime):
+    """Total, new and returning patient counts, parsing only the PatientType column"""
+    patient_types = pd.read_csv(
+        path, engine=CSV_ENGINE, usecols=['PatientType'], dtype={'PatientType': 'category'}
+    )['PatientType']
+    type_counts = patient_types.value_counts()
+    return {
+        'total': int(patient_types.size),
+        'new': int(type_counts.get('New', 0)),
+        'returning': int(type_counts.get('Returning', 0))
     }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: #5a6fd8;
+
+@st.cache_data(show_spinner=False)
+def _load_appointments(path, mtime):
+    # Served from the Parquet copy next to the workbook, rebuilt when the .xlsx is newer
+    return read_excel_fast(path, engine=EXCEL_ENGINE)
+
+@st.cache_data(show_spinner=False)
+def _load_schedules(path, mtime, columns=None):
+    # Served from the Parquet copy next to the workbook, reading only the requested columns
+    return read_excel_fast(path, engine=EXCEL_ENGINE, columns=columns)
+
+@st.cache_data(show_spinner=False)
+def _available_slot_index(path, mtime):
+    """Map each doctor to {date: [available times]}, built once per schedules version"""
+    schedules_df = _load_schedules(path, mtime, ["Doctor", "Date", "Time", "Available"])
+    available = schedules_df[schedules_df["Available"] == "Yes"]
+    return {
+        doctor: slots.groupby("Date", sort=False)["Time"].agg(list).to_dict()
+        for doctor, slots in available.groupby("Doctor", sort=False)
     }
-</style>
-""", unsafe_allow_html=True)
+
+# Number of most recent chat messages rendered on each rerun
+CHAT_WINDOW = 30
+
+# HTML tags stripped from messages before they are wrapped in a chat bubble
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Replies mentioning an error or apology are shown with the error styling
+ERROR_REPLY_RE = re.compile(r"error|sorry", re.IGNORECASE)
+
+# Messages kept in session state; older ones are appended to a per-session JSONL archive.
+# Archives hold patient details, so they are deleted on Clear/Reset and swept after a day.
+CHAT_HISTORY_LIMIT = 200
+CHAT_ARCHIVE_DIR = os.path.join(Config.DATA_DIR, "chat_archives")
+CHAT_ARCHIVE_MAX_AGE = 24 * 60 * 60
+
+# Static chat texts, built once at import rather than on every rerun or click
+WELCOME_MESSAGE = """
+    <div class="chat-message assistant-message">
+        <strong>👋 Welcome!</strong><br><br>
+        I'm your AI medical scheduling assistant powered by <strong>Gemini 2.0 Flash</strong> and a <strong>multi-agent system</strong>!<br><br>
+        I can help you:<br>
+        • 📅 Book appointments<br>
+        • 👨‍⚕️ Choose doctors<br>
+        • 📋 Manage your information<br>
+        • 💳 Handle insurance details<br><br>
+        <em>How can I assist you today?</em>
+    </div>
+"""
+
+HELP_MESSAGE = """
+    **🤖 Multi-Agent AI Assistant Guide**
+    
+    **Our specialized agents will help you:**
+    
+    🔍 **Information Collector** - Gathers your personal details
+    👤 **Patient Manager** - Handles your registration and lookup
+    📅 **Scheduler** - Manages doctor selection and appointments
+    💳 **Insurance Handler** - Processes your insurance information
+    ✅ **Confirmation Agent** - Finalizes your appointment
+    
+    **📝 Sample Conversation:**
+    1. "Hi, I'd like to book an appointment"
+    2. "My name is John Smith"
+    3. "My DOB is 01/15/1990"
+    4. "My phone is 555-123-4567"
+    5. "My email is john@email.com"
+    6. "I'd like to see Dr. Johnson"
+    7. "I'll take slot 1"
+    8. "My insurance is Blue Cross, member ID ABC123"
+    
+    **💡 Tips:**
+    • Be natural - I understand conversational language
+    • Provide information as it comes to mind
+    • I'll guide you through each step
+    • All your data is secure and private
+    • Ask "What's my name?" to check your information
+"""
+
+@st.cache_resource
+def _shared_gemini_client():
+    """One Gemini client, and its keep-alive connection pool, for every session"""
+    return GeminiClient(Config.GEMINI_API_KEY)
+
+@st.cache_data(show_spinner=False)
+def _agent_databases(mtimes):
+    """Patients and schedules frames for a new agent, parsed once per file version.
+    cache_data hands every caller its own copy, which the agent is free to modify."""
+    return load_databases()
+
+def _agent_database_mtimes():
+    paths = ("data/patients.csv", "data/schedules_new.xlsx", "data/schedules.xlsx")
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
 
 def initialize_session_state():
     """Initialize session state variables"""
     if 'agent' not in st.session_state:
-        st.session_state.agent = MultiAgentMedicalSchedulingSystem()
+        # The agent holds per-conversation state and edits its databases, so it stays
+        # per session; the LLM client and the parsed databases are shared
+        patients_db, schedules_db = _agent_databases(_agent_database_mtimes())
+        st.session_state.agent = MultiAgentMedicalSchedulingSystem(
+            gemini_client=_shared_gemini_client(),
+            patients_db=patients_db,
+            schedules_db=schedules_db
+        )
     
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        reset_chat_history()
     
     if 'current_appointment' not in st.session_state:
         st.session_state.current_appointment = None
@@ -211,6 +186,51 @@ def initialize_session_state():
     if 'data_initialized' not in st.session_state:
         st.session_state.data_initialized = False
 
+def reset_chat_history():
+    """Start an empty chat history with its own archive file, deleting the previous one"""
+    if 'chat_session_id' in st.session_state:
+        remove_chat_archive(chat_archive_path())
+    purge_stale_chat_archives()
+    st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
+    st.session_state.chat_session_id = uuid.uuid4().hex
+
+def remove_chat_archive(path: str):
+    """Delete an archive file if it is still there"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def purge_stale_chat_archives():
+    """Delete archives of sessions that have not written a message for CHAT_ARCHIVE_MAX_AGE"""
+    if not os.path.isdir(CHAT_ARCHIVE_DIR):
+        return
+    cutoff = time.time() - CHAT_ARCHIVE_MAX_AGE
+    for entry in os.scandir(CHAT_ARCHIVE_DIR):
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            # Another session swept it first
+            pass
+
+def chat_archive_path() -> str:
+    """Path of the JSONL file holding this session's archived messages"""
+    return os.path.join(CHAT_ARCHIVE_DIR, f"{st.session_state.chat_session_id}.jsonl")
+
+def append_chat_message(message: dict):
+    """Add a message to the chat history, archiving the oldest one once the history is full"""
+    # Messages never change once sent, so their bubble HTML is rendered exactly once
+    message['_html'] = history_entry_html(message)
+    history = st.session_state.chat_history
+    if len(history) == history.maxlen:
+        os.makedirs(CHAT_ARCHIVE_DIR, exist_ok=True)
+        with open(chat_archive_path(), "a", encoding="utf-8") as archive:
+            # The bubble HTML is rebuilt from the content when the archive is shown
+            archived = {key: value for key, value in history[0].items() if key != '_html'}
+            archive.write(json.dumps(archived, default=str) + "\n")
+    history.append(message)
+
 def initialize_data():
     """Initialize synthetic data if not already done"""
     if not st.session_state.data_initialized:
@@ -218,6 +238,7 @@ def initialize_data():
             # Check if data files exist
             if not os.path.exists("data/patients.csv") or not os.path.exists("data/schedules.xlsx"):
                 with st.spinner("Initializing synthetic data..."):
+                    from src.data_generator import MedicalDataGenerator
                     generator = MedicalDataGenerator()
                     generator.create_data_files()
             
@@ -227,44 +248,49 @@ def initialize_data():
         except Exception as e:
             st.error(f"❌ Failed to initialize data: {str(e)}")
 
-def display_chat_message(message: str, is_user: bool = False, message_type: str = "normal"):
-    """Display a chat message with appropriate styling"""
+def chat_bubble_html(message: str, is_user: bool = False, message_type: str = "normal") -> str:
+    """HTML for one styled chat bubble"""
     # Clean the message of any HTML tags that might have leaked in
-    import re
-    clean_message = re.sub(r'<[^>]+>', '', message)
-    # Also clean any remaining HTML entities and extra whitespace
-    clean_message = clean_message.replace('&nbsp;', ' ').strip()
+    clean_message = HTML_TAG_RE.sub('', message)
+    # Also clean any remaining HTML entities, common indentation and extra whitespace
+    clean_message = textwrap.dedent(clean_message.replace('&nbsp;', ' ')).strip()
     
     if is_user:
-        st.markdown(f"""
-        <div class="chat-message user-message">
-            <strong>You:</strong> {clean_message}
-        </div>
-        """, unsafe_allow_html=True)
+        return f'<div class="chat-message user-message">\n<strong>You:</strong> {clean_message}\n</div>'
+    
+    if message_type == "loading":
+        css_class = "chat-message loading-message"
+    elif message_type != "normal":
+        css_class = f"chat-message assistant-message {message_type}-message"
     else:
-        if message_type == "loading":
-            css_class = "chat-message loading-message"
-            st.markdown(f"""
-            <div class="{css_class}">
-                <strong>AI Assistant:</strong> {clean_message}
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            css_class = f"chat-message assistant-message {message_type}-message" if message_type != "normal" else "chat-message assistant-message"
-            st.markdown(f"""
-            <div class="{css_class}">
-                <strong>AI Assistant:</strong> {clean_message}
-            </div>
-            """, unsafe_allow_html=True)
+        css_class = "chat-message assistant-message"
+    return f'<div class="{css_class}">\n<strong>AI Assistant:</strong> {clean_message}\n</div>'
+
+def history_entry_html(entry: dict) -> str:
+    """HTML for a chat history entry, reusing the copy rendered when it was appended"""
+    html = entry.get('_html')
+    if html is None:
+        html = chat_bubble_html(entry['content'], is_user=entry['role'] == 'user', message_type=entry.get('type', 'normal'))
+    return html
+
+def display_chat_message(message: str, is_user: bool = False, message_type: str = "normal"):
+    """Display a chat message with appropriate styling"""
+    st.markdown(chat_bubble_html(message, is_user, message_type), unsafe_allow_html=True)
 
 def display_chat_history():
-    """Display the chat history"""
-    for message in st.session_state.chat_history:
-        display_chat_message(
-            message['content'], 
-            is_user=message['role'] == 'user',
-            message_type=message.get('type', 'normal')
-        )
+    """Display the most recent messages; older and archived ones are only rendered on request.
+    Each block of bubbles is sent as a single markdown element rather than one per message."""
+    archive_path = chat_archive_path()
+    if os.path.exists(archive_path) and st.toggle("Show archived messages", key="show_archived_messages"):
+        with open(archive_path, encoding="utf-8") as archive:
+            archived_html = [history_entry_html(json.loads(line)) for line in archive]
+        st.markdown("\n\n".join(archived_html), unsafe_allow_html=True)
+    
+    history = st.session_state.chat_history
+    earlier = len(history) - CHAT_WINDOW
+    if earlier > 0 and not st.toggle(f"Show {earlier} earlier messages", key="show_earlier_messages"):
+        history = islice(history, earlier, None)
+    st.markdown("\n\n".join(map(history_entry_html, history)), unsafe_allow_html=True)
 
 def display_selection_buttons():
     """Display selection buttons for doctor and slot selection"""
@@ -282,7 +308,7 @@ def display_doctor_selection_buttons():
     # Get available doctors from the system
     try:
         # Load doctors from schedule database
-        schedules_df = pd.read_excel("data/schedules.xlsx")
+        schedules_df = _load_schedules("data/schedules.xlsx", os.path.getmtime("data/schedules.xlsx"), ["Doctor"])
         available_doctors = list(schedules_df['Doctor'].unique())
         
         # Create columns for doctor buttons
@@ -319,25 +345,18 @@ def display_slot_selection_buttons():
     selected_doctor = appointment_info['doctor']
     
     try:
-        # Load available slots for the selected doctor
-        schedules_df = pd.read_excel("data/schedules.xlsx")
-        available_slots = schedules_df[
-            (schedules_df["Doctor"] == selected_doctor) & 
-            (schedules_df["Available"] == "Yes")
-        ]
-        
-        if available_slots.empty:
+        # Available slots for the selected doctor, grouped by date
+        slots_by_date = _available_slot_index(
+            "data/schedules.xlsx", os.path.getmtime("data/schedules.xlsx")
+        ).get(selected_doctor)
+        
+        if not slots_by_date:
             st.warning(f"No available slots for {selected_doctor}")
             return
         
-        # Group slots by date
-        slots_by_date = {}
-        for _, slot in available_slots.iterrows():
-            date = slot['Date']
-            time = slot['Time']
-            if date not in slots_by_date:
-                slots_by_date[date] = []
-            slots_by_date[date].append(time)
+        # Patient type decides the slot duration for every button
+        patient_info = st.session_state.agent.get_patient_info()
+        duration = 60 if patient_info.get('patient_type') == 'New' else 30
         
         # Display slots by date
         for date, times in sorted(slots_by_date.items()):
@@ -346,21 +365,17 @@ def display_slot_selection_buttons():
             # Create columns for time slots
             time_cols = st.columns(min(len(times), 4))
             
-            for i, time in enumerate(sorted(times)):
+            for i, slot_time in enumerate(sorted(times)):
                 col_idx = i % 4
                 with time_cols[col_idx]:
-                    # Get patient type to determine duration
-                    patient_info = st.session_state.agent.get_patient_info()
-                    duration = 60 if patient_info.get('patient_type') == 'New' else 30
-                    
                     if st.button(
-                        f"🕐 {time}\n({duration}min)",
-                        key=f"slot_{date}_{time}",
+                        f"🕐 {slot_time}\n({duration}min)",
+                        key=f"slot_{date}_{slot_time}",
                         use_container_width=True,
-                        help=f"Book {duration}-minute appointment on {date} at {time}"
+                        help=f"Book {duration}-minute appointment on {date} at {slot_time}"
                     ):
                         # Process slot selection
-                        process_slot_selection(selected_doctor, date, time)
+                        process_slot_selection(selected_doctor, date, slot_time)
                         
     except Exception as e:
         st.error(f"Error loading slots: {str(e)}")
@@ -369,22 +384,22 @@ def process_doctor_selection(doctor):
     """Process doctor selection"""
     try:
         # Add user message to chat
-        st.session_state.chat_history.append({
+        append_chat_message({
             'role': 'user',
             'content': f"Select {doctor}",
             'type': 'normal',
-            'timestamp': datetime.datetime.now()
+            'timestamp': time.time()
         })
         
         # Process through the agent
         response = st.session_state.agent.process_message(f"Select {doctor}")
         
         # Add assistant response
-        st.session_state.chat_history.append({
+        append_chat_message({
             'role': 'assistant',
             'content': response,
             'type': 'normal',
-            'timestamp': datetime.datetime.now()
+            'timestamp': time.time()
         })
         
         # Force rerun to update the UI
@@ -393,26 +408,26 @@ def process_doctor_selection(doctor):
     except Exception as e:
         st.error(f"Error processing doctor selection: {str(e)}")
 
-def process_slot_selection(doctor, date, time):
+def process_slot_selection(doctor, date, slot_time):
     """Process slot selection"""
     try:
         # Add user message to chat
-        st.session_state.chat_history.append({
+        append_chat_message({
             'role': 'user',
-            'content': f"Book appointment with {doctor} on {date} at {time}",
+            'content': f"Book appointment with {doctor} on {date} at {slot_time}",
             'type': 'normal',
-            'timestamp': datetime.datetime.now()
+            'timestamp': time.time()
         })
         
         # Process through the agent
-        response = st.session_state.agent.process_message(f"Book appointment with {doctor} on {date} at {time}")
+        response = st.session_state.agent.process_message(f"Book appointment with {doctor} on {date} at {slot_time}")
         
         # Add assistant response
-        st.session_state.chat_history.append({
+        append_chat_message({
             'role': 'assistant',
             'content': response,
             'type': 'normal',
-            'timestamp': datetime.datetime.now()
+            'timestamp': time.time()
         })
         
         # Force rerun to update the UI
@@ -422,15 +437,15 @@ def process_slot_selection(doctor, date, time):
         st.error(f"Error processing slot selection: {str(e)}")
 
 def process_user_input(user_input: str):
-    """Process user input through the AI agent"""
+    """Process user input through the AI agent and return the reply added to the history"""
     if not user_input.strip():
         return
     
     # Add user message to chat history immediately
-    st.session_state.chat_history.append({
+    append_chat_message({
         'role': 'user',
         'content': user_input,
-        'timestamp': datetime.datetime.now()
+        'timestamp': time.time()
     })
     
     # Create a placeholder for the AI response
@@ -445,395 +460,404 @@ def process_user_input(user_input: str):
         """, unsafe_allow_html=True)
     
     # Process through AI agent
+    agent = st.session_state.agent
     try:
-        response = st.session_state.agent.process_message(user_input)
+        response = agent.process_message(user_input)
         
         # Clear the loading indicator
         response_placeholder.empty()
         
         # Determine message type based on conversation state
-        message_type = "normal"
-        current_state = st.session_state.agent.get_conversation_state()
-        if current_state == "completed":
+        completed = agent.get_conversation_state() == ConversationState.COMPLETED.value
+        if completed:
             message_type = "success"
-        elif "error" in response.lower() or "sorry" in response.lower():
+        elif ERROR_REPLY_RE.search(response):
             message_type = "error"
+        else:
+            message_type = "normal"
         
         # Add assistant response to chat history
-        st.session_state.chat_history.append({
+        reply = {
             'role': 'assistant',
             'content': response,
             'type': message_type,
-            'timestamp': datetime.datetime.now()
-        })
+            'timestamp': time.time()
+        }
+        append_chat_message(reply)
         
         # If appointment is completed, store it
-        if current_state == "completed":
-            st.session_state.current_appointment = st.session_state.agent.get_appointment_info()
+        if completed:
+            st.session_state.current_appointment = agent.get_appointment_info()
             
     except Exception as e:
         # Clear the loading indicator
         response_placeholder.empty()
         
         error_message = f"I apologize, but I encountered an error: {str(e)}. Please try again."
-        st.session_state.chat_history.append({
+        reply = {
             'role': 'assistant',
             'content': error_message,
             'type': 'error',
-            'timestamp': datetime.datetime.now()
-        })
+            'timestamp': time.time()
+        }
+        append_chat_message(reply)
+    
+    return reply
 
-def main():
-    """Main application function"""
-    initialize_session_state()
-    initialize_data()
+def rerun_panel():
+    """Rerun only the calling fragment"""
+    st.rerun(scope="fragment")
+
+@st.fragment
+def _admin_actions():
+    """Report and export buttons; a click reruns only this block"""
+    st.markdown("### 🔧 Admin Panel")
+    st.markdown("---")
+    
+    # Admin buttons with better styling
+    if st.button("📊 Generate Reports", use_container_width=True):
+        with st.spinner("Generating reports..."):
+            try:
+                from src.excel_export import excel_exporter
+                
+                # The appointments, patient database and revenue exports are independent,
+                # so run them side by side; file I/O and zip compression release the GIL
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    futures = {
+                        "Appointments report": executor.submit(excel_exporter.export_appointments_report),
+                        "Patient database": executor.submit(excel_exporter.export_patient_database),
+                        "Revenue report": executor.submit(excel_exporter.export_revenue_report)
+                    }
+                    # Exporters log their own errors and return None instead of raising
+                    failed = [name for name, future in futures.items() if not future.result()]
+                
+                if failed:
+                    st.error(f"❌ Failed to generate: {', '.join(failed)}")
+                if len(failed) < len(futures):
+                    st.success("✅ Reports generated successfully!" if not failed else "✅ Other reports generated.")
+                    st.info("Check the 'exports' folder for generated files.")
+                
+            except Exception as e:
+                st.error(f"❌ Failed to generate reports: {str(e)}")
     
-    # Header
-    st.markdown('<h1 class="main-header">🏥 RagaAI Medical Scheduling Agent</h1>', unsafe_allow_html=True)
+    if st.button("📅 Export Today's Schedule", use_container_width=True):
+        today = datetime.date.today().isoformat()
+        with st.spinner("Exporting today's schedule..."):
+            try:
+                from src.excel_export import excel_exporter
+                daily_schedule = excel_exporter.export_daily_schedule(today)
+                if daily_schedule:
+                    st.success(f"✅ Today's schedule exported!")
+                else:
+                    st.warning("No schedule data found for today.")
+            except Exception as e:
+                st.error(f"❌ Failed to export schedule: {str(e)}")
+
+def _sidebar_status():
+    """Conversation state, patient and appointment cards"""
+    # Display current conversation state with better styling
+    st.markdown("### 📋 Current Status")
+    
+    # Status card
+    agent = st.session_state.agent
+    current_state = agent.get_conversation_state()
+    state_colors = {
+        "greeting": "🟢",
+        "collecting_info": "🟡", 
+        "patient_lookup": "🔵",
+        "new_patient_registration": "🟠",
+        "doctor_selection": "🟣",
+        "scheduling": "🔴",
+        "insurance_collection": "🟤",
+        "confirmation": "✅",
+        "completed": "🎉"
+    }
     
-    # Sidebar for admin functions
-    with st.sidebar:
-        st.markdown("### 🔧 Admin Panel")
-        st.markdown("---")
-        
-        # Admin buttons with better styling
-        if st.button("📊 Generate Reports", use_container_width=True):
-            with st.spinner("Generating reports..."):
-                try:
-                    # Generate appointments report
-                    appointments_report = excel_exporter.export_appointments_report()
-                    
-                    # Generate patient database export
-                    patient_db = excel_exporter.export_patient_database()
-                    
-                    # Generate revenue report
-                    revenue_report = excel_exporter.export_revenue_report()
-                    
-                    st.success("✅ Reports generated successfully!")
-                    st.info("Check the 'exports' folder for generated files.")
-                    
-                except Exception as e:
-                    st.error(f"❌ Failed to generate reports: {str(e)}")
-        
-        if st.button("📅 Export Today's Schedule", use_container_width=True):
-            today = datetime.date.today().strftime("%Y-%m-%d")
-            with st.spinner("Exporting today's schedule..."):
-                try:
-                    daily_schedule = excel_exporter.export_daily_schedule(today)
-                    if daily_schedule:
-                        st.success(f"✅ Today's schedule exported!")
-                    else:
-                        st.warning("No schedule data found for today.")
-                except Exception as e:
-                    st.error(f"❌ Failed to export schedule: {str(e)}")
-        
-        st.markdown("---")
-        
-        # Display current conversation state with better styling
-        st.markdown("### 📋 Current Status")
-        
-        # Status card
-        current_state = st.session_state.agent.get_conversation_state()
-        state_colors = {
-            "greeting": "🟢",
-            "collecting_info": "🟡", 
-            "patient_lookup": "🔵",
-            "new_patient_registration": "🟠",
-            "doctor_selection": "🟣",
-            "scheduling": "🔴",
-            "insurance_collection": "🟤",
-            "confirmation": "✅",
-            "completed": "🎉"
-        }
-        
+    st.markdown(f"""
+    <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
+        <strong>{state_colors.get(current_state, "⚪")} State:</strong><br>
+        <span style="color: #666; text-transform: capitalize;">{current_state.replace('_', ' ')}</span>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    patient_info = agent.get_patient_info()
+    if patient_info.get("first_name"):
         st.markdown(f"""
         <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
-            <strong>{state_colors.get(current_state, "⚪")} State:</strong><br>
-            <span style="color: #666; text-transform: capitalize;">{current_state.replace('_', ' ')}</span>
+            <strong>👤 Patient:</strong><br>
+            <span style="color: #666;">{patient_info['first_name']} {patient_info.get('last_name', '')}</span>
         </div>
         """, unsafe_allow_html=True)
-        
-        patient_info = st.session_state.agent.get_patient_info()
-        if patient_info.get("first_name"):
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
-                <strong>👤 Patient:</strong><br>
-                <span style="color: #666;">{patient_info['first_name']} {patient_info.get('last_name', '')}</span>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        appointment_info = st.session_state.agent.get_appointment_info()
-        if appointment_info:
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
-                <strong>👨‍⚕️ Doctor:</strong> {appointment_info.get('doctor', 'N/A')}<br>
-                <strong>📅 Date:</strong> {appointment_info.get('date', 'N/A')}<br>
-                <strong>⏰ Time:</strong> {appointment_info.get('time', 'N/A')}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Quick stats with better styling
-        st.markdown("### 📈 Quick Stats")
-        try:
-            patients_df = pd.read_csv("data/patients.csv")
-            appointments_df = pd.read_excel("data/appointments.xlsx")
-            
-            # Create metrics with better styling
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("👥 Total Patients", len(patients_df))
-                st.metric("🆕 New Patients", len(patients_df[patients_df['PatientType'] == 'New']))
-            with col2:
-                st.metric("📅 Total Appointments", len(appointments_df))
-                st.metric("🔄 Returning Patients", len(patients_df[patients_df['PatientType'] == 'Returning']))
-            
-        except Exception as e:
-            st.warning("Could not load statistics")
-        
-        st.markdown("---")
-        
-        # System info
-        st.markdown("### 🤖 System Info")
+    
+    appointment_info = agent.get_appointment_info()
+    if appointment_info:
         st.markdown(f"""
         <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
-            <strong>🧠 AI Provider:</strong> Gemini 2.0 Flash<br>
-            <strong>🏗️ Architecture:</strong> Multi-Agent System<br>
-            <strong>⚡ Status:</strong> <span style="color: green;">Active</span>
+            <strong>👨‍⚕️ Doctor:</strong> {appointment_info.get('doctor', 'N/A')}<br>
+            <strong>📅 Date:</strong> {appointment_info.get('date', 'N/A')}<br>
+            <strong>⏰ Time:</strong> {appointment_info.get('time', 'N/A')}
         </div>
         """, unsafe_allow_html=True)
-    
-    # Main chat interface
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        st.markdown("### 💬 Chat with AI Assistant")
-        st.markdown("---")
-        
-        # Chat container with better styling
-        chat_container = st.container()
-        
-        with chat_container:
-            # Display chat history
-            if st.session_state.chat_history:
-                display_chat_history()
-            else:
-                st.markdown("""
-                <div class="chat-message assistant-message">
-                    <strong>👋 Welcome!</strong><br><br>
-                    I'm your AI medical scheduling assistant powered by <strong>Gemini 2.0 Flash</strong> and a <strong>multi-agent system</strong>!<br><br>
-                    I can help you:<br>
-                    • 📅 Book appointments<br>
-                    • 👨‍⚕️ Choose doctors<br>
-                    • 📋 Manage your information<br>
-                    • 💳 Handle insurance details<br><br>
-                    <em>How can I assist you today?</em>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Add button-based selection interface
-            display_selection_buttons()
+
+def _quick_stats():
+    """Patient and appointment counts from the cached data files"""
+    # Quick stats with better styling
+    st.markdown("### 📈 Quick Stats")
+    try:
+        patient_counts = _patient_counts("data/patients.csv", os.path.getmtime("data/patients.csv"))
+        appointments_df = _load_appointments("data/appointments.xlsx", os.path.getmtime("data/appointments.xlsx"))
+        
+        # Create metrics with better styling
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("👥 Total Patients", patient_counts['total'])
+            st.metric("🆕 New Patients", patient_counts['new'])
+        with col2:
+            st.metric("📅 Total Appointments", len(appointments_df))
+            st.metric("🔄 Returning Patients", patient_counts['returning'])
         
-        # Chat input section
-        st.markdown("---")
-        st.markdown("### 💭 Your Message")
-        
-        # Use a form to handle Enter key properly
-        with st.form(key="chat_form", clear_on_submit=True):
-            user_input = st.text_input(
-                "Type your message here...",
-                placeholder="e.g., Hi, I'd like to book an appointment",
-                help="Type your message and press Enter or click Send"
-            )
-            
-            # Button row with better spacing
-            col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
-            
-            with col_btn1:
-                send_pressed = st.form_submit_button("📤 Send", type="primary", use_container_width=True)
-            
-            with col_btn2:
-                clear_pressed = st.form_submit_button("🗑️ Clear", use_container_width=True)
-            
-            with col_btn3:
-                help_pressed = st.form_submit_button("❓ Help", use_container_width=True)
-            
-            with col_btn4:
-                reset_pressed = st.form_submit_button("🔄 Reset", use_container_width=True)
+    except Exception as e:
+        st.warning("Could not load statistics")
+
+def _system_info():
+    """Static AI provider and architecture card"""
+    # System info
+    st.markdown("### 🤖 System Info")
+    st.markdown(f"""
+    <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 0.5rem 0;">
+        <strong>🧠 AI Provider:</strong> Gemini 2.0 Flash<br>
+        <strong>🏗️ Architecture:</strong> Multi-Agent System<br>
+        <strong>⚡ Status:</strong> <span style="color: green;">Active</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+@st.fragment
+def _chat_panel():
+    """Chat history, selection buttons and the message form"""
+    st.markdown("### 💬 Chat with AI Assistant")
+    st.markdown("---")
+    
+    # Chat container with better styling
+    chat_container = st.container()
+    
+    with chat_container:
+        # Display chat history
+        if st.session_state.chat_history:
+            display_chat_history()
+        else:
+            st.markdown(WELCOME_MESSAGE, unsafe_allow_html=True)
         
-        # Handle form submissions
-        if send_pressed:
-            if user_input.strip():
-                process_user_input(user_input)
-                st.rerun()
-            else:
-                st.warning("Please enter a message first!")
+        # Messages sent from the form below are drawn here in place, without a rerun
+        new_messages = st.container()
         
-        if clear_pressed:
-            st.session_state.chat_history = []
-            st.rerun()
+        # Add button-based selection interface
+        display_selection_buttons()
+    
+    # Chat input section
+    st.markdown("---")
+    st.markdown("### 💭 Your Message")
+    
+    # Use a form to handle Enter key properly
+    with st.form(key="chat_form", clear_on_submit=True):
+        user_input = st.text_input(
+            "Type your message here...",
+            placeholder="e.g., Hi, I'd like to book an appointment",
+            help="Type your message and press Enter or click Send"
+        )
         
-        if help_pressed:
-            help_message = """
-            **🤖 Multi-Agent AI Assistant Guide**
-            
-            **Our specialized agents will help you:**
-            
-            🔍 **Information Collector** - Gathers your personal details
-            👤 **Patient Manager** - Handles your registration and lookup
-            📅 **Scheduler** - Manages doctor selection and appointments
-            💳 **Insurance Handler** - Processes your insurance information
-            ✅ **Confirmation Agent** - Finalizes your appointment
-            
-            **📝 Sample Conversation:**
-            1. "Hi, I'd like to book an appointment"
-            2. "My name is John Smith"
-            3. "My DOB is 01/15/1990"
-            4. "My phone is 555-123-4567"
-            5. "My email is john@email.com"
-            6. "I'd like to see Dr. Johnson"
-            7. "I'll take slot 1"
-            8. "My insurance is Blue Cross, member ID ABC123"
-            
-            **💡 Tips:**
-            • Be natural - I understand conversational language
-            • Provide information as it comes to mind
-            • I'll guide you through each step
-            • All your data is secure and private
-            • Ask "What's my name?" to check your information
-            """
-            st.session_state.chat_history.append({
-                'role': 'assistant',
-                'content': help_message,
-                'type': 'normal',
-                'timestamp': datetime.datetime.now()
-            })
-            st.rerun()
-        
-        if reset_pressed:
-            st.session_state.agent.reset_conversation()
-            st.session_state.chat_history = []
-            st.session_state.current_appointment = None
-            st.success("✅ Conversation reset!")
-            st.rerun()
+        # Button row with better spacing
+        col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
+        
+        with col_btn1:
+            send_pressed = st.form_submit_button("📤 Send", type="primary", use_container_width=True)
+        
+        with col_btn2:
+            clear_pressed = st.form_submit_button("🗑️ Clear", use_container_width=True)
+        
+        with col_btn3:
+            help_pressed = st.form_submit_button("❓ Help", use_container_width=True)
+        
+        with col_btn4:
+            reset_pressed = st.form_submit_button("🔄 Reset", use_container_width=True)
+    
+    # Handle form submissions
+    if send_pressed:
+        if user_input.strip():
+            agent = st.session_state.agent
+            previous_state = agent.get_conversation_state()
+            with new_messages:
+                display_chat_message(user_input, is_user=True)
+                reply = process_user_input(user_input)
+                st.markdown(history_entry_html(reply), unsafe_allow_html=True)
+            # The sidebar status, appointment details and selection buttons only change
+            # with the conversation state; otherwise the new bubbles are already on screen
+            if agent.get_conversation_state() != previous_state:
+                st.rerun()
+        else:
+            st.warning("Please enter a message first!")
     
-    with col2:
-        st.markdown("### 📋 Appointment Details")
-        st.markdown("---")
+    if clear_pressed:
+        reset_chat_history()
+        rerun_panel()
+    
+    if help_pressed:
+        append_chat_message({
+            'role': 'assistant',
+            'content': HELP_MESSAGE,
+            'type': 'normal',
+            'timestamp': time.time()
+        })
+        rerun_panel()
+    
+    if reset_pressed:
+        st.session_state.agent.reset_conversation()
+        reset_chat_history()
+        st.session_state.current_appointment = None
+        st.success("✅ Conversation reset!")
+        st.rerun()
+
+@st.fragment
+def _appointment_details_panel():
+    """Confirmed appointment details, follow-up actions and data views"""
+    st.markdown("### 📋 Appointment Details")
+    st.markdown("---")
+    
+    if st.session_state.current_appointment:
+        appointment = st.session_state.current_appointment
+        patient_info = st.session_state.agent.get_patient_info()
         
-        if st.session_state.current_appointment:
-            appointment = st.session_state.current_appointment
-            patient_info = st.session_state.agent.get_patient_info()
-            
-            # Success banner
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); color: white; padding: 1rem; border-radius: 8px; text-align: center; margin-bottom: 1rem;">
-                <h3 style="margin: 0; color: white;">✅ Appointment Confirmed!</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Patient info card
-            st.markdown("#### 👤 Patient Information")
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
-                <strong>Name:</strong> {patient_info.get('first_name', 'N/A')} {patient_info.get('last_name', 'N/A')}<br>
-                <strong>Type:</strong> {patient_info.get('patient_type', 'N/A')} Patient<br>
-                <strong>Email:</strong> {patient_info.get('email', 'N/A')}<br>
-                <strong>Phone:</strong> {patient_info.get('phone', 'N/A')}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Appointment info card
-            st.markdown("#### 📅 Appointment Information")
-            st.markdown(f"""
-            <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
-                <strong>👨‍⚕️ Doctor:</strong> {appointment.get('doctor', 'N/A')}<br>
-                <strong>📅 Date:</strong> {appointment.get('date', 'N/A')}<br>
-                <strong>⏰ Time:</strong> {appointment.get('time', 'N/A')}<br>
-                <strong>⏱️ Duration:</strong> {appointment.get('duration', 'N/A')} minutes
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Insurance info card
-            insurance_info = appointment.get('insurance')
-            if insurance_info:
-                st.markdown("#### 💳 Insurance Information")
-                st.markdown(f"""
-                <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
-                    <strong>Carrier:</strong> {insurance_info.get('carrier', 'N/A')}<br>
-                    <strong>Member ID:</strong> {insurance_info.get('member_id', 'N/A')}<br>
-                    <strong>Group:</strong> {insurance_info.get('group_number', 'N/A')}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Action buttons
-            st.markdown("#### ⚡ Actions")
-            col_act1, col_act2 = st.columns(2)
-            
-            with col_act1:
-                if st.button("📧 Send Form", use_container_width=True):
-                    try:
-                        result = send_intake_form(patient_info.get('email', ''))
-                        st.success(result)
-                    except Exception as e:
-                        st.error(f"Failed to send intake form: {str(e)}")
-            
-            with col_act2:
-                if st.button("📅 Reminders", use_container_width=True):
-                    try:
-                        appointment_details = {
-                            'patient_name': f"{patient_info.get('first_name', '')} {patient_info.get('last_name', '')}",
-                            'patient_email': patient_info.get('email', ''),
-                            'patient_phone': patient_info.get('phone', ''),
-                            'patient_id': patient_info.get('patient_id', ''),
-                            'doctor': appointment.get('doctor', ''),
-                            'date': appointment.get('date', ''),
-                            'time': appointment.get('time', ''),
-                            'duration': appointment.get('duration', 30)
-                        }
-                        reminder_system.schedule_reminders(appointment_details)
-                        st.success("✅ Reminders scheduled!")
-                    except Exception as e:
-                        st.error(f"Failed to schedule reminders: {str(e)}")
+        # Insurance info card, only when insurance was collected
+        insurance_info = appointment.get('insurance')
+        insurance_card = f"""
+        #### 💳 Insurance Information
+        <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
+            <strong>Carrier:</strong> {insurance_info.get('carrier', 'N/A')}<br>
+            <strong>Member ID:</strong> {insurance_info.get('member_id', 'N/A')}<br>
+            <strong>Group:</strong> {insurance_info.get('group_number', 'N/A')}
+        </div>
+        """ if insurance_info else ""
         
-        else:
-            st.markdown("""
-            <div style="background: #f8f9fa; padding: 2rem; border-radius: 8px; text-align: center; border: 2px dashed #dee2e6;">
-                <h4 style="color: #6c757d; margin-bottom: 1rem;">📋 No Appointment Details</h4>
-                <p style="color: #6c757d; margin: 0;">Start a conversation to book an appointment!</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # Success banner, patient and appointment cards sent as a single element
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); color: white; padding: 1rem; border-radius: 8px; text-align: center; margin-bottom: 1rem;">
+            <h3 style="margin: 0; color: white;">✅ Appointment Confirmed!</h3>
+        </div>
         
-        st.markdown("---")
+        #### 👤 Patient Information
+        <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
+            <strong>Name:</strong> {patient_info.get('first_name', 'N/A')} {patient_info.get('last_name', 'N/A')}<br>
+            <strong>Type:</strong> {patient_info.get('patient_type', 'N/A')} Patient<br>
+            <strong>Email:</strong> {patient_info.get('email', 'N/A')}<br>
+            <strong>Phone:</strong> {patient_info.get('phone', 'N/A')}
+        </div>
         
-        # Quick actions with better styling
-        st.markdown("### ⚡ Quick Actions")
+        #### 📅 Appointment Information
+        <div style="background: white; padding: 1rem; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 1rem;">
+            <strong>👨‍⚕️ Doctor:</strong> {appointment.get('doctor', 'N/A')}<br>
+            <strong>📅 Date:</strong> {appointment.get('date', 'N/A')}<br>
+            <strong>⏰ Time:</strong> {appointment.get('time', 'N/A')}<br>
+            <strong>⏱️ Duration:</strong> {appointment.get('duration', 'N/A')} minutes
+        </div>
+        {insurance_card}
+        """, unsafe_allow_html=True)
         
-        if st.button("👥 View All Patients", use_container_width=True):
-            try:
-                patients_df = pd.read_csv("data/patients.csv")
-                st.dataframe(patients_df, use_container_width=True)
-            except Exception as e:
-                st.error(f"Could not load patients: {str(e)}")
+        # Action buttons
+        st.markdown("#### ⚡ Actions")
+        col_act1, col_act2 = st.columns(2)
         
-        if st.button("📅 View All Appointments", use_container_width=True):
-            try:
-                appointments_df = pd.read_excel("data/appointments.xlsx")
-                st.dataframe(appointments_df, use_container_width=True)
-            except Exception as e:
-                st.error(f"Could not load appointments: {str(e)}")
+        with col_act1:
+            if st.button("📧 Send Form", use_container_width=True):
+                try:
+                    result = send_intake_form(patient_info.get('email', ''))
+                    st.success(result)
+                except Exception as e:
+                    st.error(f"Failed to send intake form: {str(e)}")
         
-        if st.button("🏥 View Doctor Schedules", use_container_width=True):
-            try:
-                # Try original file first, then new file if locked
+        with col_act2:
+            if st.button("📅 Reminders", use_container_width=True):
                 try:
-                    schedules_df = pd.read_excel("data/schedules.xlsx")
-                except PermissionError:
-                    schedules_df = pd.read_excel("data/schedules_new.xlsx")
-                st.dataframe(schedules_df, use_container_width=True)
-            except Exception as e:
-                st.error(f"Could not load schedules: {str(e)}")
+                    from src.reminder_system import reminder_system
+                    appointment_details = {
+                        'patient_name': f"{patient_info.get('first_name', '')} {patient_info.get('last_name', '')}",
+                        'patient_email': patient_info.get('email', ''),
+                        'patient_phone': patient_info.get('phone', ''),
+                        'patient_id': patient_info.get('patient_id', ''),
+                        'doctor': appointment.get('doctor', ''),
+                        'date': appointment.get('date', ''),
+                        'time': appointment.get('time', ''),
+                        'duration': appointment.get('duration', 30)
+                    }
+                    reminder_system.schedule_reminders(appointment_details)
+                    st.success("✅ Reminders scheduled!")
+                except Exception as e:
+                    st.error(f"Failed to schedule reminders: {str(e)}")
+    
+    else:
+        st.markdown("""
+        <div style="background: #f8f9fa; padding: 2rem; border-radius: 8px; text-align: center; border: 2px dashed #dee2e6;">
+            <h4 style="color: #6c757d; margin-bottom: 1rem;">📋 No Appointment Details</h4>
+            <p style="color: #6c757d; margin: 0;">Start a conversation to book an appointment!</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Quick actions with better styling
+    st.markdown("### ⚡ Quick Actions")
+    
+    if st.button("👥 View All Patients", use_container_width=True):
+        try:
+            patients_df = _load_patients("data/patients.csv", os.path.getmtime("data/patients.csv"))
+            st.dataframe(patients_df, use_container_width=True)
+        except Exception as e:
+            st.error(f"Could not load patients: {str(e)}")
+    
+    if st.button("📅 View All Appointments", use_container_width=True):
+        try:
+            appointments_df = _load_appointments("data/appointments.xlsx", os.path.getmtime("data/appointments.xlsx"))
+            st.dataframe(appointments_df, use_container_width=True)
+        except Exception as e:
+            st.error(f"Could not load appointments: {str(e)}")
+    
+    if st.button("🏥 View Doctor Schedules", use_container_width=True):
+        try:
+            # Try original file first, then new file if locked
+            try:
+                schedules_df = _load_schedules("data/schedules.xlsx", os.path.getmtime("data/schedules.xlsx"))
+            except PermissionError:
+                schedules_df = _load_schedules("data/schedules_new.xlsx", os.path.getmtime("data/schedules_new.xlsx"))
+            st.dataframe(schedules_df, use_container_width=True)
+        except Exception as e:
+            st.error(f"Could not load schedules: {str(e)}")
+
+def main():
+    """Main application function"""
+    initialize_session_state()
+    initialize_data()
+    
+    # Header
+    st.markdown('<h1 class="main-header">🏥 RagaAI Medical Scheduling Agent</h1>', unsafe_allow_html=True)
+    
+    # Panels with buttons are fragments, so a click inside one reruns only that panel.
+    # The status and stats blocks have no widgets of their own; they refresh on the
+    # full reruns that follow a conversation state change
+    with st.sidebar:
+        _admin_actions()
+        st.markdown("---")
+        _sidebar_status()
+        st.markdown("---")
+        _quick_stats()
+        st.markdown("---")
+        _system_info()
+    
+    # Main chat interface
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        _chat_panel()
+    
+    with col2:
+        _appointment_details_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,36 @@
+"""
+Uvicorn server settings for the web chatbot
+Kept apart from chatbot_ui so launchers can read them without importing the app
+"""
+
+import os
+from importlib.util import find_spec
+
+# Largest inbound WebSocket frame; chat turns are a few hundred bytes at most
+MAX_MESSAGE_SIZE = 8 * 1024
+
+def web_concurrency() -> int:
+    """Worker count from WEB_CONCURRENCY, or one per CPU when it is unset or malformed"""
+    default = os.cpu_count() or 1
+    try:
+        workers = int(os.getenv("WEB_CONCURRENCY", default))
+    except ValueError:
+        print(f"⚠️  Ignoring invalid WEB_CONCURRENCY={os.getenv('WEB_CONCURRENCY')!r}; using {default} workers")
+        return default
+    return workers if workers > 0 else default
+
+# Uvicorn server settings shared by `python chatbot_ui.py` and start_chatbot.py.
+# Prefer the compiled implementations (uvloop, httptools, websockets) when they are
+# installed; uvloop is not available on Windows. Each worker process keeps its own
+# ConnectionManager, and a WebSocket stays on the worker that accepted it.
+SERVER_OPTIONS = {
+    "loop": "uvloop" if find_spec("uvloop") else "auto",
+    "http": "httptools" if find_spec("httptools") else "auto",
+    "ws": "websockets" if find_spec("websockets") else "auto",
+    "ws_per_message_deflate": True,
+    # Oversized frames are refused by the protocol layer before they are buffered
+    "ws_max_size": MAX_MESSAGE_SIZE,
+    # Skip uvicorn's per-request access log; connection events go through our own logger
+    "access_log": False,
+    "workers": web_concurrency(),
+}
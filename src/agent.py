@@ -26,6 +26,9 @@ class ConversationState(Enum):
     CONFIRMATION = "confirmation"
     COMPLETED = "completed"
 
+class AgentReplyError(Exception):
+    """A streamed turn that failed; the message is the reply to show the user"""
+
 @dataclass
 class PatientInfo:
     """Patient information structure"""
@@ -621,3 +624,8 @@ Is there anything else I can help you with?
         self.current_patient = PatientInfo()
         self.current_appointment = None
         self.conversation_history = []
+    
+    def reload_data(self):
+        """Re-read the patient and schedule files, e.g. before reusing the agent"""
+        self.patients_db = self._load_patients_db()
+        self.schedules_db = self._load_schedules_db()
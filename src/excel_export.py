@@ -9,8 +9,17 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from datetime import datetime, timedelta
 import os
+import heapq
 from typing import Dict, List, Optional
 
+# XlsxWriter writes formatted rows in one pass; without it, exports are written
+# with openpyxl and formatted in a second pass
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 class ExcelExporter:
     """Handles Excel export functionality for admin review"""
     
@@ -40,25 +49,14 @@ class ExcelExporter:
             filename = f"appointments_report_{timestamp}.xlsx"
             filepath = os.path.join(self.export_dir, filename)
             
-            # Create workbook with multiple sheets
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Main appointments sheet
-                appointments_df.to_excel(writer, sheet_name='Appointments', index=False)
-                
-                # Summary statistics sheet
-                summary_df = self._create_summary_statistics(appointments_df)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Doctor performance sheet
-                doctor_stats_df = self._create_doctor_statistics(appointments_df)
-                doctor_stats_df.to_excel(writer, sheet_name='Doctor_Stats', index=False)
-                
-                # Patient demographics sheet
-                demographics_df = self._create_demographics_report(appointments_df)
-                demographics_df.to_excel(writer, sheet_name='Demographics', index=False)
-            
-            # Format the Excel file
-            self._format_excel_file(filepath)
+            # Create workbook with multiple sheets: the appointments themselves,
+            # summary statistics, doctor performance and patient demographics
+            self._write_workbook(filepath, {
+                'Appointments': appointments_df,
+                'Summary': self._create_summary_statistics(appointments_df),
+                'Doctor_Stats': self._create_doctor_statistics(appointments_df),
+                'Demographics': self._create_demographics_report(appointments_df)
+            })
             
             print(f"✅ Appointments report exported to {filepath}")
             return filepath
@@ -88,15 +86,13 @@ class ExcelExporter:
             filepath = os.path.join(self.export_dir, filename)
             
             # Export to Excel
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                daily_schedule_df.to_excel(writer, sheet_name='Daily_Schedule', index=False)
-                
-                # Add appointment details sheet
-                if not daily_appointments.empty:
-                    daily_appointments.to_excel(writer, sheet_name='Appointment_Details', index=False)
+            sheets = {'Daily_Schedule': daily_schedule_df}
             
-            # Format the Excel file
-            self._format_excel_file(filepath)
+            # Add appointment details sheet
+            if not daily_appointments.empty:
+                sheets['Appointment_Details'] = daily_appointments
+            
+            self._write_workbook(filepath, sheets)
             
             print(f"✅ Daily schedule exported to {filepath}")
             return filepath
@@ -116,16 +112,11 @@ class ExcelExporter:
             filename = f"patient_database_{timestamp}.xlsx"
             filepath = os.path.join(self.export_dir, filename)
             
-            # Export to Excel with formatting
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                patients_df.to_excel(writer, sheet_name='Patients', index=False)
-                
-                # Add patient statistics
-                stats_df = self._create_patient_statistics(patients_df)
-                stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-            
-            # Format the Excel file
-            self._format_excel_file(filepath)
+            # Export to Excel with formatting, adding patient statistics
+            self._write_workbook(filepath, {
+                'Patients': patients_df,
+                'Statistics': self._create_patient_statistics(patients_df)
+            })
             
             print(f"✅ Patient database exported to {filepath}")
             return filepath
@@ -163,12 +154,10 @@ class ExcelExporter:
             filepath = os.path.join(self.export_dir, filename)
             
             # Export to Excel
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                revenue_df.to_excel(writer, sheet_name='Revenue_Summary', index=False)
-                appointments_df.to_excel(writer, sheet_name='Detailed_Revenue', index=False)
-            
-            # Format the Excel file
-            self._format_excel_file(filepath)
+            self._write_workbook(filepath, {
+                'Revenue_Summary': revenue_df,
+                'Detailed_Revenue': appointments_df
+            })
             
             print(f"✅ Revenue report exported to {filepath}")
             return filepath
@@ -351,6 +340,48 @@ class ExcelExporter:
         except:
             return 0
     
+    def _write_workbook(self, filepath: str, sheets: Dict[str, pd.DataFrame]):
+        """Write one sheet per DataFrame with the standard header, border and width styling"""
+        if not XLSXWRITER_AVAILABLE:
+            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            self._format_excel_file(filepath)
+            return
+        
+        # constant_memory flushes each row to disk once the next one starts,
+        # so rows must be written strictly top to bottom
+        workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+        try:
+            header_format = workbook.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+                'align': 'center', 'valign': 'vcenter', 'border': 1
+            })
+            cell_format = workbook.add_format({'border': 1})
+            date_format = workbook.add_format({'border': 1, 'num_format': 'yyyy-mm-dd hh:mm:ss'})
+            
+            for sheet_name, df in sheets.items():
+                worksheet = workbook.add_worksheet(sheet_name)
+                column_formats = [
+                    date_format if pd.api.types.is_datetime64_any_dtype(dtype) else cell_format
+                    for dtype in df.dtypes
+                ]
+                
+                # Column widths fit the longest value, capped at 50 characters
+                for col_num, column in enumerate(df.columns):
+                    max_length = max([len(str(column))] + [len(str(value)) for value in df[column]])
+                    worksheet.set_column(col_num, col_num, min(max_length + 2, 50))
+                
+                worksheet.write_row(0, 0, [str(column) for column in df.columns], header_format)
+                
+                # Python scalars, with missing values as blank cells
+                values = df.astype(object).where(df.notna(), None)
+                for row_num, row in enumerate(values.itertuples(index=False), start=1):
+                    for col_num, value in enumerate(row):
+                        worksheet.write(row_num, col_num, value, column_formats[col_num])
+        finally:
+            workbook.close()
+    
     def _format_excel_file(self, filepath: str):
         """Format Excel file with styling"""
         try:
@@ -421,6 +452,24 @@ class ExcelExporter:
                     })
         
         return sorted(exports, key=lambda x: x['modified'], reverse=True)
+    
+    def get_recent_exports(self, n: int = 5) -> List[Dict]:
+        """Get the n most recently modified exports, newest first"""
+        if not os.path.exists(self.export_dir):
+            return []
+        
+        # scandir caches each entry's stat; nlargest avoids sorting every export
+        with os.scandir(self.export_dir) as entries:
+            files = [(entry, entry.stat()) for entry in entries if entry.name.endswith('.xlsx')]
+        recent = heapq.nlargest(n, files, key=lambda item: item[1].st_mtime)
+        
+        return [{
+            'filename': entry.name,
+            'filepath': entry.path,
+            'size': file_stats.st_size,
+            'created': datetime.fromtimestamp(file_stats.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
+            'modified': datetime.fromtimestamp(file_stats.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+        } for entry, file_stats in recent]
 
 # Global exporter instance
 excel_exporter = ExcelExporter()
@@ -29,6 +29,9 @@ class GeminiClient:
             'Content-Type': 'application/json',
             'X-goog-api-key': self.api_key
         }
+        # Keep-alive session: a turn makes several sequential calls, so reuse one TLS connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def generate_content(self, prompt: str, system_prompt: str = None) -> GeminiResponse:
         """Generate content using Gemini API"""
@@ -53,9 +56,8 @@ class GeminiClient:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
-                headers=self.headers,
                 json=payload,
                 timeout=30
             )
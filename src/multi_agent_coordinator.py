@@ -46,15 +46,17 @@ class AgentResponse:
 class MultiAgentCoordinator:
     """Coordinates multiple specialized agents for medical scheduling"""
     
-    def __init__(self, gemini_api_key: str = None):
-        """Initialize the multi-agent coordinator"""
+    def __init__(self, gemini_api_key: str = None, gemini_client: GeminiClient = None,
+                 patients_db: pd.DataFrame = None, schedules_db: pd.DataFrame = None):
+        """Initialize the multi-agent coordinator, optionally around a shared Gemini client
+        and preloaded databases (which the agents modify, so each coordinator needs its own copy)"""
         
         # Initialize Gemini client
-        self.gemini = GeminiClient(gemini_api_key)
+        self.gemini = gemini_client or GeminiClient(gemini_api_key)
         
         # Load databases
-        self.patients_db = self._load_patients_db()
-        self.schedules_db = self._load_schedules_db()
+        self.patients_db = patients_db if patients_db is not None else self._load_patients_db()
+        self.schedules_db = schedules_db if schedules_db is not None else self._load_schedules_db()
         
         # Initialize specialized agents
         self.information_collector = InformationCollectorAgent(self.gemini)
@@ -72,14 +74,16 @@ class MultiAgentCoordinator:
             available_slots=[]
         )
     
-    def _load_patients_db(self) -> pd.DataFrame:
+    @staticmethod
+    def _load_patients_db() -> pd.DataFrame:
         """Load patient database from CSV"""
         try:
             return pd.read_csv("data/patients.csv")
         except FileNotFoundError:
             return pd.DataFrame()
     
-    def _load_schedules_db(self) -> pd.DataFrame:
+    @staticmethod
+    def _load_schedules_db() -> pd.DataFrame:
         """Load doctor schedules from Excel"""
         try:
             try:
@@ -608,3 +612,7 @@ Is there anything else I can help you with?
     def get_appointment_info(self) -> Optional[AppointmentInfo]:
         """Get current appointment information"""
         return self.context.appointment_info
+
+def load_databases():
+    """Read the patients and schedules frames a new coordinator starts from"""
+    return MultiAgentCoordinator._load_patients_db(), MultiAgentCoordinator._load_schedules_db()
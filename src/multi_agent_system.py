@@ -4,7 +4,9 @@ Main entry point for the multi-agent scheduling system using Gemini API
 """
 
 from typing import Dict, List, Optional, Any
+import pandas as pd
 from src.multi_agent_coordinator import MultiAgentCoordinator
+from src.gemini_client import GeminiClient
 from src.agent import ConversationState, PatientInfo, AppointmentInfo
 from config import Config
 
@@ -13,14 +15,16 @@ class MultiAgentMedicalSchedulingSystem:
     Main medical scheduling system using multiple specialized agents
     """
     
-    def __init__(self, gemini_api_key: str = None):
-        """Initialize the multi-agent system"""
+    def __init__(self, gemini_api_key: str = None, gemini_client: GeminiClient = None,
+                 patients_db: pd.DataFrame = None, schedules_db: pd.DataFrame = None):
+        """Initialize the multi-agent system; gemini_client and the databases can be supplied
+        so sessions skip rebuilding them"""
         
         # Get API key from config or parameter
         api_key = gemini_api_key or Config.GEMINI_API_KEY
         
         # Initialize the coordinator
-        self.coordinator = MultiAgentCoordinator(api_key)
+        self.coordinator = MultiAgentCoordinator(api_key, gemini_client, patients_db, schedules_db)
         
         # System state
         self.is_active = True
@@ -14,7 +14,7 @@ import pandas as pd
 from datetime import datetime
 
 # Local imports
-from src.agent import PatientInfo, AppointmentInfo, ConversationState
+from src.agent import PatientInfo, AppointmentInfo, ConversationState, AgentReplyError
 from fuzzywuzzy import fuzz
 
 class ConversationMemory(TypedDict):
@@ -76,6 +76,40 @@ class OllamaLLM:
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
             return "I'm sorry, I encountered an error. Please try again."
+    
+    def stream(self, prompt: str):
+        """Invoke the Ollama model, yielding the response text as it is generated"""
+        try:
+            payload = {
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": 0.1,
+                    "top_p": 0.9,
+                    "max_tokens": 1000
+                }
+            }
+            
+            with requests.post(self.api_url, json=payload, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    part = json.loads(line)
+                    if part.get("response"):
+                        yield part["response"]
+                    if part.get("done"):
+                        break
+            
+        # Raised rather than yielded, so a failure is never glued onto a partial reply
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Ollama API error: {e}")
+            raise AgentReplyError("I'm sorry, I'm having trouble connecting to the AI service. Please try again.") from e
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            raise AgentReplyError("I'm sorry, I encountered an error. Please try again.") from e
 
 class OllamaMedicalSchedulingAgent:
     """
@@ -142,6 +176,42 @@ class OllamaMedicalSchedulingAgent:
             self.conversation_history.append({"role": "assistant", "content": error_response})
             return error_response
     
+    def process_message_stream(self, user_input: str):
+        """Process user message like process_message, yielding the response in pieces
+        
+        The pieces join up to the process_message response (up to surrounding whitespace).
+        A failure raises AgentReplyError carrying the error reply, even after pieces were yielded.
+        """
+        
+        # Add user message to conversation history
+        self.conversation_history.append({"role": "user", "content": user_input})
+        
+        # Create context for the LLM
+        context = self._build_context(user_input)
+        
+        try:
+            streamed = []
+            for delta in self.llm.stream(context):
+                streamed.append(delta)
+                yield delta
+            raw_response = "".join(streamed).strip()
+            
+            # State updates only ever append to the LLM text, so send just the addition
+            response = self._process_llm_response(raw_response, user_input)
+            if response.startswith(raw_response) and len(response) > len(raw_response):
+                yield response[len(raw_response):]
+            
+            # Add response to conversation history
+            self.conversation_history.append({"role": "assistant", "content": response})
+            
+        except AgentReplyError as e:
+            self.conversation_history.append({"role": "assistant", "content": str(e)})
+            raise
+        except Exception as e:
+            error_response = f"I apologize, but I encountered an error: {str(e)}. Please try again."
+            self.conversation_history.append({"role": "assistant", "content": error_response})
+            raise AgentReplyError(error_response) from e
+    
     def _build_context(self, user_input: str) -> str:
         """Build context for the LLM"""
         
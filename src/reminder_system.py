@@ -17,40 +17,29 @@ from typing import List, Dict, Optional
 import os
 from twilio.rest import Client
 import json
+from dataclasses import replace
+from config import EMAIL_CFG, SMS_CFG
+
+# Reminders have always defaulted to a placeholder sender rather than Config's noreply
+# address; keep that default so an unset EMAIL_ADDRESS behaves as before
+REMINDER_EMAIL_CFG = replace(EMAIL_CFG, email=os.getenv("EMAIL_ADDRESS", "your-email@example.com"))
 
 class ReminderSystem:
     """Automated reminder system for medical appointments"""
     
     def __init__(self):
-        self.email_config = self._load_email_config()
-        self.sms_config = self._load_sms_config()
+        # Shared frozen settings from config.py, built once at import
+        self.email_config = REMINDER_EMAIL_CFG
+        self.sms_config = SMS_CFG
         self.reminders_sent = set()  # Track sent reminders to avoid duplicates
         
-    def _load_email_config(self) -> Dict:
-        """Load email configuration from environment or config file"""
-        return {
-            "smtp_server": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
-            "smtp_port": int(os.getenv("SMTP_PORT", "587")),
-            "email": os.getenv("EMAIL_ADDRESS", "your-email@example.com"),
-            "password": os.getenv("EMAIL_PASSWORD", "your-app-password"),
-            "from_name": "RagaAI Medical Scheduling"
-        }
-    
-    def _load_sms_config(self) -> Dict:
-        """Load SMS configuration from environment or config file"""
-        return {
-            "account_sid": os.getenv("TWILIO_ACCOUNT_SID", "your-account-sid"),
-            "auth_token": os.getenv("TWILIO_AUTH_TOKEN", "your-auth-token"),
-            "from_number": os.getenv("TWILIO_FROM_NUMBER", "+1234567890")
-        }
-    
     def send_email_reminder(self, patient_email: str, patient_name: str, 
                           appointment_details: Dict, reminder_type: str) -> bool:
         """Send email reminder to patient"""
         try:
             # Create message
             msg = MIMEMultipart()
-            msg['From'] = f"{self.email_config['from_name']} <{self.email_config['email']}>"
+            msg['From'] = f"{self.email_config.from_name} <{self.email_config.email}>"
             msg['To'] = patient_email
             msg['Subject'] = self._get_email_subject(reminder_type, appointment_details)
             
@@ -63,11 +52,11 @@ class ReminderSystem:
                 self._attach_intake_form(msg)
             
             # Send email
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
+            server = smtplib.SMTP(self.email_config.smtp_server, self.email_config.smtp_port)
             server.starttls()
-            server.login(self.email_config['email'], self.email_config['password'])
+            server.login(self.email_config.email, self.email_config.password)
             text = msg.as_string()
-            server.sendmail(self.email_config['email'], patient_email, text)
+            server.sendmail(self.email_config.email, patient_email, text)
             server.quit()
             
             print(f"✅ Email reminder sent to {patient_name} ({patient_email})")
@@ -82,7 +71,7 @@ class ReminderSystem:
         """Send SMS reminder to patient"""
         try:
             # Initialize Twilio client
-            client = Client(self.sms_config['account_sid'], self.sms_config['auth_token'])
+            client = Client(self.sms_config.account_sid, self.sms_config.auth_token)
             
             # Create SMS message
             message_body = self._create_sms_body(patient_name, appointment_details, reminder_type)
@@ -90,7 +79,7 @@ class ReminderSystem:
             # Send SMS
             message = client.messages.create(
                 body=message_body,
-                from_=self.sms_config['from_number'],
+                from_=self.sms_config.from_number,
                 to=patient_phone
             )
             
@@ -7,8 +7,13 @@ from email import encoders
 import os
 import pandas as pd
 import datetime
+import threading
+from importlib.util import find_spec
 from typing import Dict, List, Optional
 
+# Excel data files are read through a Parquet copy when a Parquet engine is installed
+PARQUET_AVAILABLE = bool(find_spec("pyarrow") or find_spec("fastparquet"))
+
 def send_intake_form(email: str, pdf_path: str = "forms/New Patient Intake Form.pdf") -> str:
     """
     Send intake form to patient via email
@@ -216,6 +221,49 @@ def backup_data():
     except Exception as e:
         return f"❌ Backup failed: {str(e)}"
 
+def read_excel_fast(path: str, engine: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read an Excel data file through a Parquet copy kept next to it
+    
+    The copy is stamped with the workbook's mtime and rebuilt whenever the two
+    differ, so code that writes the .xlsx needs no changes. Without a Parquet
+    engine the workbook is read directly.
+    
+    Args:
+        path: Path to the .xlsx file
+        engine: pandas Excel engine used when the workbook itself has to be parsed
+        columns: Only return these columns (all columns when None)
+    
+    Returns:
+        The first sheet as a DataFrame
+    """
+    if not PARQUET_AVAILABLE:
+        return pd.read_excel(path, engine=engine, usecols=columns)
+    
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    # The copy carries the workbook's mtime, so any other mtime means it is stale
+    source_mtime = os.stat(path).st_mtime_ns
+    if os.path.exists(parquet_path) and os.stat(parquet_path).st_mtime_ns == source_mtime:
+        try:
+            # Parquet is columnar, so unrequested columns are never decoded
+            return pd.read_parquet(parquet_path, columns=columns)
+        except Exception as e:
+            print(f"⚠️  Could not read Parquet copy of {path}, using the workbook: {str(e)}")
+    
+    # The copy always holds every column so later callers can ask for any of them
+    df = pd.read_excel(path, engine=engine)
+    # Write to a temp file and swap it in, so concurrent readers never see a partial copy
+    temp_path = f"{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(temp_path, index=False)
+        os.utime(temp_path, ns=(source_mtime, source_mtime))
+        os.replace(temp_path, parquet_path)
+    except Exception as e:
+        print(f"⚠️  Could not write Parquet copy of {path}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return df if columns is None else df[columns]
+
 def get_system_stats() -> Dict:
     """
     Get system statistics
@@ -238,12 +286,12 @@ def get_system_stats() -> Dict:
         
         # Count appointments
         if os.path.exists("data/appointments.xlsx"):
-            appointments_df = pd.read_excel("data/appointments.xlsx")
+            appointments_df = read_excel_fast("data/appointments.xlsx")
             stats['appointments'] = len(appointments_df)
         
         # Count doctors and available slots
         if os.path.exists("data/schedules.xlsx"):
-            schedules_df = pd.read_excel("data/schedules.xlsx")
+            schedules_df = read_excel_fast("data/schedules.xlsx")
             stats['doctors'] = len(schedules_df['Doctor'].unique())
             stats['available_slots'] = len(schedules_df[schedules_df['Available'] == 'Yes'])
         
@@ -70,12 +70,14 @@ def main():
     # Start the FastAPI server
     try:
         import uvicorn
+        # The settings module is light; the app itself is only imported by the workers
+        from server_config import SERVER_OPTIONS
         uvicorn.run(
             "chatbot_ui:app",
             host="0.0.0.0",
             port=8000,
-            reload=False,
-            log_level="info"
+            log_level="info",
+            **SERVER_OPTIONS
         )
     except KeyboardInterrupt:
         print("\n👋 Server stopped. Goodbye!")
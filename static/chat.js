@@ -0,0 +1,426 @@
+let ws;
+let isConnected = false;
+const textDecoder = new TextDecoder();
+// One formatter for every timestamp; toLocaleTimeString builds a new one per call
+const TIME_FMT = new Intl.DateTimeFormat(undefined, {timeStyle: 'medium'});
+const msgTpl = document.getElementById('msgTpl');
+const summaryTpl = document.getElementById('summaryTpl');
+// Nodes added since the last frame; appended and scrolled once per animation frame
+let pendingNodes = null;
+// Everything shown below the welcome message, oldest first, as functions that build
+// its node. Only entries from firstRendered on are in the DOM; older ones are rebuilt
+// when the user scrolls back up.
+const MAX_RENDERED = 200;
+const RESTORE_BATCH = 50;
+const chatHistory = [];
+let firstRendered = 0;
+// User messages the server has not answered yet, by clientId, in send order
+const unacked = new Map();
+let nextClientId = 1;
+// Frames for clientIds below this belong to a conversation that was reset
+let firstLiveClientId = 1;
+// Replies still being streamed, by clientId
+const streams = new Map();
+
+function connect() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const wsUrl = `${protocol}//${window.location.host}/ws`;
+
+    ws = new WebSocket(wsUrl);
+    ws.binaryType = 'arraybuffer';
+
+    ws.onopen = function(event) {
+        isConnected = true;
+        updateConnectionStatus('connected', 'Connected');
+        console.log('Connected to WebSocket');
+    };
+
+    ws.onmessage = function(event) {
+        const data = JSON.parse(typeof event.data === 'string' ? event.data : textDecoder.decode(event.data));
+
+        if (data.type === 'batch') {
+            data.messages.forEach(handleMessage);
+        } else {
+            handleMessage(data);
+        }
+    };
+
+    ws.onclose = function(event) {
+        isConnected = false;
+        updateConnectionStatus('disconnected', 'Disconnected');
+        console.log('WebSocket connection closed');
+
+        // The server drops its agent with the connection, so unanswered messages are
+        // never replayed automatically: a lost reply may already have been acted on
+        failPendingMessages();
+
+        // Try to reconnect after 3 seconds
+        setTimeout(connect, 3000);
+    };
+
+    ws.onerror = function(error) {
+        console.error('WebSocket error:', error);
+        updateConnectionStatus('disconnected', 'Connection Error');
+    };
+}
+
+function handleMessage(data) {
+    if (data.clientId !== undefined && data.clientId < firstLiveClientId) {
+        return;
+    }
+    if ((data.type === 'message' || data.type === 'message_end') && data.clientId !== undefined) {
+        // Replies may arrive in any order; keep typing until every message is answered
+        unacked.delete(data.clientId);
+        if (data.type === 'message_end') {
+            endStream(data.clientId, data.message_type || 'normal');
+        } else {
+            streams.delete(data.clientId);
+        }
+    }
+    if (unacked.size === 0) {
+        hideTypingIndicator();
+    }
+
+    if (data.type === 'chunk') {
+        appendChunk(data);
+    } else if (data.type === 'message') {
+        addMessage(data.message, 'assistant', data.message_type || 'normal', data.ts);
+    } else if (data.type === 'doctor_selection') {
+        showDoctorSelection(data.doctors);
+    } else if (data.type === 'appointment_summary') {
+        showAppointmentSummary(data.appointment);
+    } else if (data.type === 'status') {
+        updateConnectionStatus('connected', data.message);
+    }
+}
+
+function sendToServer(message) {
+    const clientId = nextClientId++;
+    unacked.set(clientId, message);
+    showTypingIndicator();
+    ws.send(JSON.stringify({
+        type: 'message',
+        message: message,
+        clientId: clientId
+    }));
+}
+
+function failPendingMessages() {
+    unacked.forEach(message => showUndelivered(message));
+    unacked.clear();
+    streams.clear();
+    hideTypingIndicator();
+}
+
+function showUndelivered(message) {
+    const ts = Date.now();
+    appendToChat(() => {
+        const messageDiv = buildMessage(`⚠️ No reply received for "${message}" before the connection dropped.`, 'assistant', 'error', ts);
+        const resendButton = document.createElement('button');
+        resendButton.className = 'change-selection-btn';
+        resendButton.textContent = '↻ Send again';
+        resendButton.addEventListener('click', () => {
+            if (isConnected) {
+                resendButton.remove();
+                sendQuickMessage(message);
+            }
+        });
+        messageDiv.querySelector('.message-content').appendChild(resendButton);
+        return messageDiv;
+    });
+}
+
+function sendMessage() {
+    const input = document.getElementById('messageInput');
+    const message = input.value.trim();
+
+    if (message && isConnected) {
+        addMessage(message, 'user');
+        input.value = '';
+
+        // Send message to server; this shows the typing indicator
+        sendToServer(message);
+    }
+}
+
+function sendQuickMessage(message) {
+    if (isConnected) {
+        addMessage(message, 'user');
+        sendToServer(message);
+    }
+}
+
+function resetConversation() {
+    if (isConnected) {
+        ws.send(JSON.stringify({
+            type: 'reset'
+        }));
+
+        // Clear chat messages except welcome
+        const chatMessages = document.getElementById('chatMessages');
+        const welcomeMessage = chatMessages.querySelector('.message.assistant');
+        chatMessages.innerHTML = '';
+        chatMessages.appendChild(welcomeMessage);
+        chatHistory.length = 0;
+        firstRendered = 0;
+        // Replies to the old conversation are no longer shown
+        firstLiveClientId = nextClientId;
+        unacked.clear();
+        streams.clear();
+        hideTypingIndicator();
+        if (pendingNodes) {
+            pendingNodes.replaceChildren();
+        }
+    }
+}
+
+function appendToChat(render) {
+    chatHistory.push(render);
+    if (!pendingNodes) {
+        pendingNodes = document.createDocumentFragment();
+        requestAnimationFrame(() => {
+            const chatMessages = document.getElementById('chatMessages');
+            chatMessages.appendChild(pendingNodes);
+            trimRendered(chatMessages);
+            chatMessages.scrollTop = chatMessages.scrollHeight;
+            pendingNodes = null;
+        });
+    }
+    pendingNodes.appendChild(render());
+}
+
+function trimRendered(chatMessages) {
+    // The welcome message stays first; drop the oldest entries after it
+    const welcomeMessage = chatMessages.firstElementChild;
+    while (chatHistory.length - firstRendered > MAX_RENDERED) {
+        welcomeMessage.nextElementSibling.remove();
+        firstRendered++;
+    }
+}
+
+function restoreOlder(chatMessages) {
+    const start = Math.max(0, firstRendered - RESTORE_BATCH);
+    const fragment = document.createDocumentFragment();
+    chatHistory.slice(start, firstRendered).forEach(render => fragment.appendChild(render()));
+
+    // Keep the messages the user is looking at in place
+    const previousHeight = chatMessages.scrollHeight;
+    chatMessages.insertBefore(fragment, chatMessages.firstElementChild.nextSibling);
+    chatMessages.scrollTop += chatMessages.scrollHeight - previousHeight;
+    firstRendered = start;
+}
+
+function addMessage(content, sender, messageType = 'normal', ts = Date.now()) {
+    appendToChat(() => buildMessage(content, sender, messageType, ts));
+}
+
+function buildMessage(content, sender, messageType, ts) {
+    const messageDiv = msgTpl.content.firstElementChild.cloneNode(true);
+    messageDiv.className = `message ${sender}`;
+
+    if (sender === 'assistant' && messageType !== 'normal') {
+        messageDiv.classList.add(messageType);
+    }
+
+    // Agent replies are plain text, so they are never parsed as HTML
+    messageDiv.querySelector('.msg-body').textContent = content;
+    // Server frames carry their send time in epoch milliseconds
+    messageDiv.querySelector('.message-time').textContent = TIME_FMT.format(new Date(ts));
+    return messageDiv;
+}
+
+function appendChunk(data) {
+    let stream = streams.get(data.clientId);
+    if (!stream) {
+        // The first chunk opens the reply's bubble; later chunks fill it in
+        stream = {text: '', messageType: 'normal', node: null};
+        streams.set(data.clientId, stream);
+        appendToChat(() => (stream.node = buildMessage(stream.text, 'assistant', stream.messageType, data.ts)));
+    }
+    stream.text += data.delta;
+    if (stream.node) {
+        stream.node.querySelector('.msg-body').textContent = stream.text;
+        const chatMessages = document.getElementById('chatMessages');
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+}
+
+function endStream(clientId, messageType) {
+    const stream = streams.get(clientId);
+    if (!stream) {
+        return;
+    }
+    streams.delete(clientId);
+    stream.messageType = messageType;
+    if (stream.node && messageType !== 'normal') {
+        stream.node.classList.add(messageType);
+    }
+}
+
+function showAppointmentSummary(appointment) {
+    appendToChat(() => buildAppointmentSummary(appointment));
+}
+
+function buildAppointmentSummary(appointment) {
+    const summaryDiv = summaryTpl.content.firstElementChild.cloneNode(true);
+    const fields = {
+        patient: appointment.patient,
+        doctor: appointment.doctor,
+        date: appointment.date,
+        time: appointment.time,
+        duration: appointment.duration,
+        type: appointment.patient_type
+    };
+    for (const [name, value] of Object.entries(fields)) {
+        summaryDiv.querySelector(`[data-field="${name}"]`).textContent = value;
+    }
+    return summaryDiv;
+}
+
+function showDoctorSelection(doctorList) {
+    appendToChat(() => buildDoctorSelection(doctorList));
+}
+
+function buildDoctorSelection(doctorList) {
+    // Built from nodes so doctor names are always text, never markup or handler code.
+    // Every lookup stays inside this picker, so several pickers can be on screen at once.
+    const selectionDiv = document.createElement('div');
+    selectionDiv.className = 'doctor-selection';
+
+    const heading = document.createElement('h4');
+    heading.textContent = '👨‍⚕️ Select Your Doctor';
+
+    const searchDiv = document.createElement('div');
+    searchDiv.className = 'doctor-search';
+    const searchInput = document.createElement('input');
+    searchInput.type = 'text';
+    searchInput.className = 'doctor-search-input';
+    searchInput.placeholder = 'Search doctors by name...';
+    searchInput.addEventListener('keyup', () => filterDoctors(selectionDiv));
+    searchDiv.appendChild(searchInput);
+
+    const grid = document.createElement('div');
+    grid.className = 'doctor-grid';
+    doctorList.forEach(doctor => {
+        const option = document.createElement('div');
+        option.className = 'doctor-option';
+        option.textContent = doctor;
+        option.dataset.name = doctor.toLowerCase();
+        option.addEventListener('click', () => {
+            // Only one doctor can be picked until the selection is changed
+            if (!selectionDiv.dataset.selected) {
+                selectDoctor(selectionDiv, doctor);
+            }
+        });
+        grid.appendChild(option);
+    });
+
+    const actions = document.createElement('div');
+    actions.className = 'selection-actions';
+    actions.style.cssText = 'display: none; margin-top: 15px; text-align: center;';
+    const changeButton = document.createElement('button');
+    changeButton.className = 'change-selection-btn';
+    changeButton.textContent = '🔄 Change Selection';
+    changeButton.addEventListener('click', () => resetDoctorSelection(selectionDiv));
+    actions.appendChild(changeButton);
+
+    selectionDiv.append(heading, searchDiv, grid, actions);
+    return selectionDiv;
+}
+
+function filterDoctors(selectionDiv) {
+    const searchTerm = selectionDiv.querySelector('.doctor-search-input').value.toLowerCase();
+    const doctorOptions = selectionDiv.querySelectorAll('.doctor-option');
+
+    doctorOptions.forEach(option => {
+        const doctorName = option.dataset.name;
+        if (doctorName.includes(searchTerm)) {
+            option.style.display = 'block';
+        } else {
+            option.style.display = 'none';
+        }
+    });
+}
+
+function selectDoctor(selectionDiv, doctorName) {
+    selectionDiv.dataset.selected = doctorName;
+
+    // Mark the selected doctor and grey out the others
+    const doctorOptions = selectionDiv.querySelectorAll('.doctor-option');
+    doctorOptions.forEach(option => {
+        if (option.textContent === doctorName) {
+            option.classList.add('selected');
+        } else {
+            option.style.opacity = '0.5';
+            option.style.cursor = 'not-allowed';
+        }
+    });
+
+    // Show the change selection button
+    selectionDiv.querySelector('.selection-actions').style.display = 'block';
+
+    // Add a confirmation message
+    addMessage(`✅ Selected: ${doctorName}`, 'user');
+
+    // Send doctor selection to server
+    if (isConnected) {
+        sendToServer(doctorName);
+    }
+}
+
+function resetDoctorSelection(selectionDiv) {
+    delete selectionDiv.dataset.selected;
+
+    // Reset all doctor options
+    const doctorOptions = selectionDiv.querySelectorAll('.doctor-option');
+    doctorOptions.forEach(option => {
+        option.classList.remove('selected');
+        option.style.opacity = '1';
+        option.style.cursor = 'pointer';
+    });
+
+    // Hide the change selection button
+    selectionDiv.querySelector('.selection-actions').style.display = 'none';
+
+    // Clear the search input and reset the filter
+    selectionDiv.querySelector('.doctor-search-input').value = '';
+    filterDoctors(selectionDiv);
+
+    // Add a reset message
+    addMessage('🔄 Selection reset - please choose a doctor', 'user');
+}
+
+function showTypingIndicator() {
+    document.getElementById('typingIndicator').style.display = 'block';
+    const chatMessages = document.getElementById('chatMessages');
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+}
+
+function hideTypingIndicator() {
+    document.getElementById('typingIndicator').style.display = 'none';
+}
+
+function updateConnectionStatus(status, message) {
+    const statusElement = document.getElementById('connectionStatus');
+    statusElement.className = `connection-status ${status}`;
+    statusElement.textContent = message;
+}
+
+// Event listeners
+document.getElementById('messageInput').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        sendMessage();
+    }
+});
+
+document.getElementById('chatMessages').addEventListener('scroll', function() {
+    if (this.scrollTop < 100 && firstRendered > 0) {
+        restoreOlder(this);
+    }
+});
+
+// Set welcome message time
+document.getElementById('welcomeTime').textContent = TIME_FMT.format(new Date());
+
+// Connect when page loads
+connect();